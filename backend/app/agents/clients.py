@@ -0,0 +1,103 @@
+"""
+Shared API clients for the pipeline agents.
+Each client is built once and shared so its HTTP connection pool (and warm
+TLS sessions) survive across agent instances. The async HTTP client belongs
+to the event loop that first uses it, so whoever owns the loop (a pipeline
+run, the app lifespan) calls close_clients() before the loop ends.
+"""
+
+from functools import lru_cache
+from typing import Optional
+import httpx
+from langchain_openai import ChatOpenAI, OpenAIEmbeddings
+from ..config import get_settings
+
+EXTRACTION_MODEL = "gpt-4o-mini"  # Cost-effective model
+
+# Must match VectorStore, which queries the same index
+EMBEDDING_MODEL = "text-embedding-3-small"
+EMBEDDING_DIMENSION = 512
+
+
+@lru_cache()
+def get_openai_http_client() -> httpx.AsyncClient:
+    """Get the async HTTP client shared by all OpenAI-backed clients."""
+    return httpx.AsyncClient(
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        timeout=httpx.Timeout(60.0)
+    )
+
+
+@lru_cache()
+def get_chat_llm() -> Optional[ChatOpenAI]:
+    """Get the cached extraction chat model, or None if OpenAI isn't configured."""
+    settings = get_settings()
+    if not settings.openai_api_key:
+        return None
+
+    return ChatOpenAI(
+        model=EXTRACTION_MODEL,
+        temperature=0,
+        api_key=settings.openai_api_key,
+        http_async_client=get_openai_http_client()
+    )
+
+
+@lru_cache()
+def get_embeddings() -> Optional[OpenAIEmbeddings]:
+    """Get the cached embeddings client, or None if OpenAI isn't configured."""
+    settings = get_settings()
+    if not settings.openai_api_key:
+        return None
+
+    return OpenAIEmbeddings(
+        model=EMBEDDING_MODEL,
+        dimensions=EMBEDDING_DIMENSION,
+        api_key=settings.openai_api_key,
+        http_async_client=get_openai_http_client()
+    )
+
+
+async def close_clients():
+    """
+    Close the shared async HTTP client and drop the OpenAI clients built on
+    it; the next call to a getter builds fresh ones on the current loop.
+    """
+    if get_openai_http_client.cache_info().currsize:
+        await get_openai_http_client().aclose()
+    get_chat_llm.cache_clear()
+    get_embeddings.cache_clear()
+    get_openai_http_client.cache_clear()
+
+
+@lru_cache()
+def get_pinecone_index():
+    """
+    Get the cached Pinecone index, creating it if it doesn't exist.
+    Returns None if Pinecone isn't configured or initialization fails.
+    """
+    settings = get_settings()
+    if not settings.pinecone_api_key:
+        return None
+
+    try:
+        from pinecone import Pinecone
+
+        pc = Pinecone(api_key=settings.pinecone_api_key)
+
+        # Create index if it doesn't exist
+        index_name = settings.pinecone_index_name
+        if index_name not in pc.list_indexes().names():
+            pc.create_index(
+                name=index_name,
+                dimension=EMBEDDING_DIMENSION,
+                metric="cosine"
+            )
+
+        index = pc.Index(index_name)
+        print(f"Pinecone initialized with index: {index_name}")
+        return index
+
+    except Exception as e:
+        print(f"Pinecone initialization failed: {e}")
+        return None
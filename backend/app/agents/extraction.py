@@ -3,12 +3,118 @@ Agent 3: Extraction Agent
 Uses LLM to extract structured job data from raw text.
 """
 
+import asyncio
+import html
+import json
+import re
+from functools import lru_cache
 from typing import Optional
-from langchain_openai import ChatOpenAI
+import tiktoken
+from openai import APIConnectionError, APITimeoutError, InternalServerError, RateLimitError
 from langchain_core.prompts import ChatPromptTemplate
 from pydantic import BaseModel, Field
 from .base import BaseAgent
-from ..config import get_settings
+from .clients import EXTRACTION_MODEL, get_chat_llm
+from ..config import get_settings, Settings
+
+# Global LLM cache is process-wide, only configure it once
+_llm_cache_initialized = False
+
+
+def _init_llm_cache(settings: Settings):
+    """
+    Enable LangChain's global LLM cache so identical prompts skip the API.
+    Safe because extraction runs with temperature=0.
+    """
+    global _llm_cache_initialized
+    if _llm_cache_initialized:
+        return
+    
+    from langchain_core.globals import set_llm_cache
+    
+    try:
+        if settings.redis_url:
+            import redis
+            from langchain_community.cache import RedisCache
+            set_llm_cache(RedisCache(redis.Redis.from_url(settings.redis_url)))
+        else:
+            from langchain_community.cache import SQLiteCache
+            set_llm_cache(SQLiteCache(database_path=settings.llm_cache_path))
+    except Exception as e:
+        print(f"LLM cache initialization failed: {e}")
+    
+    _llm_cache_initialized = True
+
+
+def _load_encoding() -> Optional[tiktoken.Encoding]:
+    """
+    Load the extraction model's tokenizer, or None if it can't be fetched.
+    tiktoken downloads the BPE file on first use, so call this off the event loop.
+    """
+    try:
+        try:
+            return tiktoken.encoding_for_model(EXTRACTION_MODEL)
+        except KeyError:
+            # Older tiktoken releases don't know gpt-4o-mini yet
+            return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        print(f"Tokenizer unavailable, truncating extraction input by bytes: {e}")
+        return None
+
+
+def _truncate_tokens(text: str, max_tokens: int, encoding: Optional[tiktoken.Encoding]) -> str:
+    """Truncate text to at most max_tokens tokens of the extraction model."""
+    # Every token covers at least one UTF-8 byte, so texts that are short
+    # in bytes fit as-is (non-ASCII characters can be several tokens each)
+    if len(text.encode("utf-8")) <= max_tokens:
+        return text
+    
+    if encoding is None:
+        # Byte-truncating keeps the same guarantee without a tokenizer
+        return text.encode("utf-8")[:max_tokens].decode("utf-8", errors="ignore")
+    
+    tokens = encoding.encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text
+    return encoding.decode(tokens[:max_tokens])
+
+
+_HTML_TAG = re.compile(r"<[^>]+>")
+
+
+def _ld_text(value) -> Optional[str]:
+    """Read a JSON-LD value that may be a string or an object with a name."""
+    if isinstance(value, list):
+        value = value[0] if value else None
+    if isinstance(value, dict):
+        value = value.get("name")
+    if isinstance(value, str) and value.strip():
+        return value.strip()
+    return None
+
+
+def _ld_location(posting: dict) -> Optional[str]:
+    """Build a location string from a JobPosting's jobLocation address."""
+    if posting.get("jobLocationType") == "TELECOMMUTE":
+        return "Remote"
+    
+    locations = posting.get("jobLocation")
+    if isinstance(locations, list):
+        locations = locations[0] if locations else None
+    if not isinstance(locations, dict):
+        return None
+    
+    address = locations.get("address")
+    if isinstance(address, str):
+        return address.strip() or None
+    if not isinstance(address, dict):
+        return None
+    
+    parts = [
+        _ld_text(address.get(key))
+        for key in ("addressLocality", "addressRegion", "addressCountry")
+    ]
+    return ", ".join(p for p in parts if p) or None
 
 
 class ExtractedJob(BaseModel):
@@ -20,13 +126,32 @@ class ExtractedJob(BaseModel):
     description: Optional[str] = Field(default=None, description="Brief job description")
 
 
+class BatchExtractedJob(ExtractedJob):
+    """Extracted job tagged with the id of the text it came from."""
+    id: int = Field(description="The id of the input text this job was extracted from")
+
+
+class BatchExtracted(BaseModel):
+    """Structured output for a batch of job texts."""
+    jobs: list[BatchExtractedJob] = Field(description="One extracted job per input text")
+
+
 class ExtractionAgent(BaseAgent):
     """
     Extracts structured job information from raw text using OpenAI.
     """
 
+    # Maximum in-flight OpenAI requests
+    MAX_CONCURRENCY = 10
+    MAX_RETRIES = 5
+    
+    # Texts packed into a single LLM request, and per-text token budget
+    BATCH_SIZE = 8
+    MAX_TEXT_TOKENS = 800
+
     EXTRACTION_PROMPT = ChatPromptTemplate.from_messages([
-        ("system", """You are a job posting extractor. Extract job information from the provided text.
+        ("system", """You are a job posting extractor. You will receive a JSON list of texts,
+each with an "id" and a "text". Extract job information from every text.
 Focus on finding:
 - Job title/position name
 - Company name
@@ -35,18 +160,34 @@ Focus on finding:
 - Brief description (1-2 sentences)
 
 If information is not found, use reasonable defaults or leave empty.
+Return exactly one job per input text and copy its "id" unchanged.
 Respond ONLY with valid JSON matching the required format."""),
-        ("human", "Extract job posting information from this text:\n\n{text}")
+        ("human", "Extract job posting information from these texts:\n\n{texts_json}")
     ])
 
     def __init__(self):
         settings = get_settings()
         self.llm = None
+        self.chain = None
+        
+        # Tokenizer is loaded on the first LLM run; None after a failed load
+        self.encoding: Optional[tiktoken.Encoding] = None
+        self._encoding_loaded = False
         if settings.openai_api_key:
-            self.llm = ChatOpenAI(
-                model="gpt-4o-mini",  # Cost-effective model
-                temperature=0,
-                api_key=settings.openai_api_key
+            _init_llm_cache(settings)
+            self.llm = get_chat_llm()
+            self.chain = self.EXTRACTION_PROMPT | self.llm.with_structured_output(
+                BatchExtracted
+            ).with_retry(
+                # Transient failures only - bad requests won't succeed on retry
+                retry_if_exception_type=(
+                    RateLimitError,
+                    APITimeoutError,
+                    APIConnectionError,
+                    InternalServerError,
+                ),
+                wait_exponential_jitter=True,
+                stop_after_attempt=self.MAX_RETRIES
             )
 
     @property
@@ -63,36 +204,112 @@ Respond ONLY with valid JSON matching the required format."""),
         Returns:
             List of ExtractedJob objects
         """
+        # Pages with complete JobPosting structured data skip the LLM entirely
+        extracted_jobs = []
+        remaining = []
+        for item in scraped_content:
+            job = self._fast_extract(item)
+            if job:
+                extracted_jobs.append(job)
+            else:
+                remaining.append(item)
+        
         if not self.llm:
             print("Warning: OpenAI API key not configured. Using mock extraction.")
-            return self._mock_extract(scraped_content)
+            return extracted_jobs + self._mock_extract(remaining)
         
-        extracted_jobs = []
+        if not self._encoding_loaded:
+            self.encoding = await asyncio.to_thread(_load_encoding)
+            self._encoding_loaded = True
         
-        for item in scraped_content:
-            content = item.get("content", "")
-            if not content:
+        items = [item for item in remaining if item.get("content")]
+        batches = [
+            items[i:i + self.BATCH_SIZE]
+            for i in range(0, len(items), self.BATCH_SIZE)
+        ]
+        extracted_jobs.extend(await self._extract_batches(batches))
+        return extracted_jobs
+
+    async def _extract_batches(self, batches: list[list[dict]]) -> list[ExtractedJob]:
+        """
+        Extract jobs from batches of texts, one LLM request per batch.
+        One unreadable text (or a malformed response) fails its whole batch,
+        so texts from failed batches are retried one per request.
+        """
+        inputs = [{"texts_json": self._format_batch(batch)} for batch in batches]
+        
+        # Always pass max_concurrency explicitly so a large batch doesn't
+        # fire every request at once and trip OpenAI rate limits
+        results = await self.chain.abatch(
+            inputs,
+            config={"max_concurrency": self.MAX_CONCURRENCY},
+            return_exceptions=True
+        )
+        
+        extracted_jobs = []
+        failed = []
+        for batch, result in zip(batches, results):
+            if isinstance(result, Exception):
+                print(f"Extraction error: {result}")
+                if len(batch) > 1:
+                    failed.extend(batch)
                 continue
             
-            try:
-                # Use structured output
-                structured_llm = self.llm.with_structured_output(ExtractedJob)
-                result = await structured_llm.ainvoke(
-                    self.EXTRACTION_PROMPT.format_messages(text=content[:3000])
-                )
+            for batch_job in result.jobs:
+                if not 0 <= batch_job.id < len(batch):
+                    continue
+                item = batch[batch_job.id]
+                job = ExtractedJob(**batch_job.model_dump(exclude={"id"}))
                 
                 # Add URL from original if not extracted
-                if not result.apply_url:
-                    result.apply_url = item.get("url", "")
-                
-                extracted_jobs.append(result)
+                if not job.apply_url:
+                    job.apply_url = item.get("url", "")
                 
-            except Exception as e:
-                print(f"Extraction error: {e}")
-                continue
+                extracted_jobs.append(job)
+        
+        if failed:
+            extracted_jobs.extend(await self._extract_batches([[item] for item in failed]))
         
         return extracted_jobs
 
+    def _fast_extract(self, item: dict) -> Optional[ExtractedJob]:
+        """
+        Build an ExtractedJob from the page's schema.org JobPosting JSON-LD.
+        Returns None unless title, company and location are all present.
+        """
+        posting = item.get("job_posting")
+        if not posting:
+            return None
+        
+        title = _ld_text(posting.get("title"))
+        company = _ld_text(posting.get("hiringOrganization"))
+        location = _ld_location(posting)
+        if not (title and company and location):
+            return None
+        
+        description = _ld_text(posting.get("description"))
+        if description:
+            description = _HTML_TAG.sub(" ", html.unescape(description))
+            description = " ".join(description.split())[:300]
+        
+        return ExtractedJob(
+            job_title=title,
+            company=company,
+            location=location,
+            apply_url=_ld_text(posting.get("url")) or item.get("url", ""),
+            description=description or None
+        )
+
+    def _format_batch(self, batch: list[dict]) -> str:
+        """Serialize a batch of scraped items as an id-tagged JSON list."""
+        return json.dumps(
+            [
+                {"id": i, "text": _truncate_tokens(item["content"], self.MAX_TEXT_TOKENS, self.encoding)}
+                for i, item in enumerate(batch)
+            ],
+            ensure_ascii=False
+        )
+
     def _mock_extract(self, scraped_content: list[dict]) -> list[ExtractedJob]:
         """Mock extraction when API key is not available."""
         jobs = []
@@ -107,10 +324,17 @@ Respond ONLY with valid JSON matching the required format."""),
         return jobs
 
 
+@lru_cache()
+def get_extraction_agent() -> ExtractionAgent:
+    """
+    Get cached Extraction Agent instance.
+    Reuses one ChatOpenAI client and its HTTPS connection pool.
+    """
+    return ExtractionAgent()
+
+
 # Allow running directly for testing
 if __name__ == "__main__":
-    import asyncio
-    
     async def test():
         agent = ExtractionAgent()
         test_content = [{
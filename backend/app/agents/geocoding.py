@@ -3,12 +3,24 @@ Agent 4: Geocoding Agent
 Converts location strings to lat/lng coordinates using Nominatim.
 """
 
+import asyncio
+import re
+from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Optional, Tuple
-from geopy.geocoders import Nominatim
-from geopy.exc import GeocoderTimedOut, GeocoderServiceError
-import time
+import aiohttp
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_random_exponential
 from .base import BaseAgent
 from .extraction import ExtractedJob
+from ..database import SessionLocal
+from ..db_models import GeocodeCacheDB
+
+
+def _is_transient_http_error(exc: BaseException) -> bool:
+    """Timeouts, dropped connections, 429s and 5xx are worth retrying."""
+    if isinstance(exc, aiohttp.ClientResponseError):
+        return exc.status == 429 or exc.status >= 500
+    return isinstance(exc, (asyncio.TimeoutError, aiohttp.ClientConnectionError))
 
 
 class GeocodedJob(ExtractedJob):
@@ -23,6 +35,12 @@ class GeocodingAgent(BaseAgent):
     Uses Nominatim (OpenStreetMap) - free, no API key required.
     """
 
+    NOMINATIM_URL = "https://nominatim.openstreetmap.org/search"
+    
+    # Nominatim usage policy requires an identifying User-Agent
+    HEADERS = {"User-Agent": "india-job-map"}
+    REQUEST_TIMEOUT = 10
+
     # Cache for common Indian cities
     CITY_CACHE = {
         "bangalore": (12.9716, 77.5946),
@@ -42,9 +60,55 @@ class GeocodingAgent(BaseAgent):
         "remote": (20.5937, 78.9629),  # India center for remote
         "india": (20.5937, 78.9629),
     }
+    
+    # Keys that only say "somewhere in India" - a named city wins over them
+    GENERIC_LOCATIONS = frozenset({"remote", "india"})
+    
+    # Longest cache key in words (e.g. "new delhi")
+    MAX_CITY_WORDS = max(len(name.split()) for name in CITY_CACHE)
+    
+    TOKEN_SPLIT = re.compile(r"[^a-z]+")
+    
+    # Failed lookups are retried after this long
+    NEGATIVE_CACHE_TTL = timedelta(days=1)
 
     def __init__(self):
-        self.geolocator = Nominatim(user_agent="india-job-map")
+        # Loop-bound state, created by _bind_loop() inside a running loop
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+        # Nominatim allows one request per second - serialize cache misses only
+        self._nominatim_lock: Optional[asyncio.Semaphore] = None
+        # Uncached lookups in progress, so concurrent jobs share one request
+        self._in_flight: dict[str, asyncio.Future] = {}
+
+    def _bind_loop(self):
+        """
+        Recreate loop-bound state when called from a new event loop.
+        The agent is a process-wide singleton, but semaphores, futures and
+        aiohttp sessions only work on the loop that created them.
+        """
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._session = None
+            self._nominatim_lock = asyncio.Semaphore(1)
+            self._in_flight = {}
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Get or create the shared HTTP session."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                headers=self.HEADERS,
+                timeout=aiohttp.ClientTimeout(total=self.REQUEST_TIMEOUT)
+            )
+        return self._session
+
+    async def close(self):
+        """Close the shared HTTP session and forget this loop's state."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._loop = None
 
     @property
     def name(self) -> str:
@@ -60,54 +124,180 @@ class GeocodingAgent(BaseAgent):
         Returns:
             List of GeocodedJob with lat/lng
         """
-        geocoded_jobs = []
-        
+        # Geocode each distinct location once, then fan out to jobs
+        unique_locations: dict[str, str] = {}
         for job in extracted_jobs:
-            lat, lng = await self._geocode_location(job.location)
-            
-            geocoded_job = GeocodedJob(
-                job_title=job.job_title,
-                company=job.company,
-                location=job.location,
-                apply_url=job.apply_url,
-                description=job.description,
-                lat=lat,
-                lng=lng
-            )
-            geocoded_jobs.append(geocoded_job)
+            unique_locations.setdefault(self._location_key(job.location), job.location)
         
-        return geocoded_jobs
+        coords_list = await asyncio.gather(*[
+            self._geocode_location(location) for location in unique_locations.values()
+        ])
+        coords_map = dict(zip(unique_locations, coords_list))
+        
+        return [
+            self._with_coords(job, *coords_map[self._location_key(job.location)])
+            for job in extracted_jobs
+        ]
+
+    async def geocode_job(self, job: ExtractedJob) -> GeocodedJob:
+        """Add coordinates to a single extracted job."""
+        lat, lng = await self._geocode_location(job.location)
+        return self._with_coords(job, lat, lng)
+
+    @staticmethod
+    def _location_key(location: Optional[str]) -> str:
+        """Normalize a location string for deduplication and caching."""
+        return (location or "").lower().strip()
+
+    @staticmethod
+    def _with_coords(job: ExtractedJob, lat: float, lng: float) -> GeocodedJob:
+        """Build a GeocodedJob from an extracted job and its coordinates."""
+        return GeocodedJob(
+            job_title=job.job_title,
+            company=job.company,
+            location=job.location,
+            apply_url=job.apply_url,
+            description=job.description,
+            lat=lat,
+            lng=lng
+        )
 
     async def _geocode_location(self, location: str) -> Tuple[float, float]:
         """Geocode a location string to coordinates."""
         if not location:
             return 20.5937, 78.9629  # Default: India center
         
+        self._bind_loop()
+        
         # Normalize location
-        location_lower = location.lower().strip()
+        location_lower = self._location_key(location)
         
         # Check cache first
-        for key, coords in self.CITY_CACHE.items():
-            if key in location_lower:
-                return coords
+        coords = self._lookup_city(location_lower)
+        if coords:
+            return coords
+        
+        # Then results persisted from earlier runs (sync SQLite, off the loop)
+        coords = await asyncio.to_thread(self._get_persisted, location_lower)
+        if coords:
+            return coords
         
-        # Try Nominatim for unknown locations
+        # Join a lookup another worker already started for this location
+        task = self._in_flight.get(location_lower)
+        if task is None:
+            task = asyncio.ensure_future(self._geocode_remote(location, location_lower))
+            self._in_flight[location_lower] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(location_lower, None))
+        # Shielded so one cancelled caller doesn't cancel the shared lookup
+        return await asyncio.shield(task)
+
+    async def _geocode_remote(self, location: str, location_lower: str) -> Tuple[float, float]:
+        """Geocode an uncached location with Nominatim and persist the result."""
         try:
-            time.sleep(1)  # Rate limiting for Nominatim
-            result = self.geolocator.geocode(f"{location}, India", timeout=10)
-            if result:
-                return (result.latitude, result.longitude)
-        except (GeocoderTimedOut, GeocoderServiceError) as e:
+            async with self._nominatim_lock:
+                # An earlier lookup may have finished while we waited
+                coords = await asyncio.to_thread(self._get_persisted, location_lower)
+                if coords:
+                    return coords
+                
+                await asyncio.sleep(1)  # Rate limiting for Nominatim
+                data = await self._query_nominatim(location)
+            
+            # Persist after releasing the lock so the next lookup isn't held up
+            if data:
+                coords = (float(data[0]["lat"]), float(data[0]["lon"]))
+                await asyncio.to_thread(self._persist, location_lower, coords, True)
+                return coords
+            # No match - remember the miss so it isn't retried every run
+            await asyncio.to_thread(self._persist, location_lower, (20.5937, 78.9629), False)
+        except (aiohttp.ClientError, asyncio.TimeoutError, KeyError, ValueError) as e:
             print(f"Geocoding error for '{location}': {e}")
         
         # Default to India center
         return 20.5937, 78.9629
 
+    @retry(
+        retry=retry_if_exception(_is_transient_http_error),
+        wait=wait_random_exponential(min=1, max=10),
+        stop=stop_after_attempt(3),
+        reraise=True
+    )
+    async def _query_nominatim(self, location: str) -> list[dict]:
+        """Search Nominatim for a location within India."""
+        params = {"q": f"{location}, India", "format": "json", "limit": 1}
+        async with self._get_session().get(self.NOMINATIM_URL, params=params) as response:
+            response.raise_for_status()
+            return await response.json()
+
+    def _get_persisted(self, location_lower: str) -> Optional[Tuple[float, float]]:
+        """Look up a previously geocoded location in the database cache."""
+        db = SessionLocal()
+        try:
+            entry = db.get(GeocodeCacheDB, location_lower)
+            if entry is None:
+                return None
+            if not entry.found and datetime.utcnow() - entry.updated_at > self.NEGATIVE_CACHE_TTL:
+                return None
+            return (entry.lat, entry.lng)
+        except Exception as e:
+            print(f"Geocode cache read error: {e}")
+            return None
+        finally:
+            db.close()
+
+    def _persist(self, location_lower: str, coords: Tuple[float, float], found: bool):
+        """Store a geocoding result in the database cache."""
+        db = SessionLocal()
+        try:
+            db.merge(GeocodeCacheDB(
+                location=location_lower,
+                lat=coords[0],
+                lng=coords[1],
+                found=found,
+                updated_at=datetime.utcnow()
+            ))
+            db.commit()
+        except Exception as e:
+            print(f"Geocode cache write error: {e}")
+            db.rollback()
+        finally:
+            db.close()
+
+    def _lookup_city(self, location_lower: str) -> Optional[Tuple[float, float]]:
+        """
+        Match whole words (and multi-word names) against the city cache.
+        A specific city anywhere in the string beats a generic key like
+        "remote", so "Remote / Bangalore" resolves to Bangalore.
+        """
+        tokens = [t for t in self.TOKEN_SPLIT.split(location_lower) if t]
+        generic = None
+        
+        for i in range(len(tokens)):
+            # Prefer the longest name starting here ("new delhi" over "delhi")
+            for n in range(min(self.MAX_CITY_WORDS, len(tokens) - i), 0, -1):
+                name = " ".join(tokens[i:i + n])
+                coords = self.CITY_CACHE.get(name)
+                if not coords:
+                    continue
+                if name not in self.GENERIC_LOCATIONS:
+                    return coords
+                generic = generic or coords
+                break
+        
+        return generic
+
+
+@lru_cache()
+def get_geocoding_agent() -> GeocodingAgent:
+    """
+    Get cached Geocoding Agent instance.
+    One instance per process so the Nominatim rate limit is global.
+    """
+    return GeocodingAgent()
+
 
 # Allow running directly for testing
 if __name__ == "__main__":
-    import asyncio
-    
     async def test():
         agent = GeocodingAgent()
         test_jobs = [
@@ -125,6 +315,7 @@ if __name__ == "__main__":
             )
         ]
         results = await agent.run(test_jobs)
+        await agent.close()
         
         print(f"\nGeocoded {len(results)} jobs:\n")
         for job in results:
@@ -3,22 +3,38 @@ Agent 5: Indexing Agent
 Stores jobs in database and Pinecone vector store.
 """
 
+import asyncio
 import uuid
+import urllib3
 from datetime import datetime
+from functools import lru_cache
 from typing import Optional
-from sqlalchemy.orm import Session
+from sqlalchemy import update
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_random_exponential
 from .base import BaseAgent
 from .geocoding import GeocodedJob
+from .clients import get_embeddings, get_pinecone_index
 from ..config import get_settings
-from ..database import SessionLocal
+from ..database import get_async_sessionmaker
 from ..db_models import JobPostingDB
 
 
+def _is_retryable_pinecone_error(exc: BaseException) -> bool:
+    """Retry network failures, 429s and 5xx - not client errors like bad dimensions."""
+    status = getattr(exc, "status", None)
+    if isinstance(status, int):
+        return status == 429 or status >= 500
+    return isinstance(exc, (OSError, urllib3.exceptions.HTTPError))
+
+
 class IndexingAgent(BaseAgent):
     """
     Indexes jobs in SQLite database and optionally Pinecone.
     """
 
+    # Pinecone recommends at most 100 vectors per upsert request
+    UPSERT_BATCH_SIZE = 100
+
     def __init__(self):
         self.settings = get_settings()
         self.pinecone_index = None
@@ -26,32 +42,8 @@ class IndexingAgent(BaseAgent):
         
         # Initialize Pinecone if API key is available
         if self.settings.pinecone_api_key and self.settings.openai_api_key:
-            self._init_pinecone()
-
-    def _init_pinecone(self):
-        """Initialize Pinecone connection."""
-        try:
-            from pinecone import Pinecone
-            from langchain_openai import OpenAIEmbeddings
-            
-            pc = Pinecone(api_key=self.settings.pinecone_api_key)
-            
-            # Create index if it doesn't exist
-            index_name = self.settings.pinecone_index_name
-            if index_name not in pc.list_indexes().names():
-                pc.create_index(
-                    name=index_name,
-                    dimension=1536,  # OpenAI embedding dimension
-                    metric="cosine"
-                )
-            
-            self.pinecone_index = pc.Index(index_name)
-            self.embeddings = OpenAIEmbeddings(api_key=self.settings.openai_api_key)
-            print(f"Pinecone initialized with index: {index_name}")
-            
-        except Exception as e:
-            print(f"Pinecone initialization failed: {e}")
-            self.pinecone_index = None
+            self.pinecone_index = get_pinecone_index()
+            self.embeddings = get_embeddings()
 
     @property
     def name(self) -> str:
@@ -67,76 +59,140 @@ class IndexingAgent(BaseAgent):
         Returns:
             List of indexed job records
         """
-        indexed = []
-        db = SessionLocal()
+        if not geocoded_jobs:
+            return []
+        
+        job_ids = [str(uuid.uuid4()) for _ in geocoded_jobs]
+        use_pinecone = bool(self.pinecone_index and self.embeddings)
+        
+        indexed_at = datetime.utcnow()
+        rows = [
+            {
+                "id": job_id,
+                "job_title": job.job_title,
+                "company": job.company,
+                "location": job.location,
+                "apply_url": job.apply_url or "",
+                "lat": job.lat,
+                "lng": job.lng,
+                "text": job.description,
+                "source": "pipeline",
+                "scraped_at": indexed_at,
+                # Optimistic - cleared below if the vector upsert fails
+                "embedding_id": job_id if use_pinecone else None
+            }
+            for job_id, job in zip(job_ids, geocoded_jobs)
+        ]
+        
+        # SQLite insert proceeds while embeddings are generated
+        db_task = asyncio.create_task(self._bulk_insert(rows))
+        
+        embedded = False
+        if use_pinecone:
+            embedded = await self._index_vectors(job_ids, geocoded_jobs)
+        
+        if not await db_task:
+            return []
         
+        if use_pinecone and not embedded:
+            await self._clear_embedding_ids(job_ids)
+        
+        print(f"Indexed {len(rows)} jobs to database")
+        return [
+            {
+                "id": row["id"],
+                "job_title": row["job_title"],
+                "company": row["company"],
+                "location": row["location"],
+                "lat": row["lat"],
+                "lng": row["lng"],
+                "indexed_at": indexed_at.isoformat()
+            }
+            for row in rows
+        ]
+
+    async def _index_vectors(self, job_ids: list[str], jobs: list[GeocodedJob]) -> bool:
+        """Embed jobs in one request and upsert them to Pinecone."""
         try:
-            for job in geocoded_jobs:
-                job_id = str(uuid.uuid4())
-                embedding_id = None
-                
-                # Generate embedding and store in Pinecone
-                if self.pinecone_index and self.embeddings:
-                    try:
-                        text_to_embed = f"{job.job_title} at {job.company}. {job.description or ''}"
-                        embedding = await self.embeddings.aembed_query(text_to_embed)
-                        
-                        self.pinecone_index.upsert(vectors=[{
-                            "id": job_id,
-                            "values": embedding,
-                            "metadata": {
-                                "job_title": job.job_title,
-                                "company": job.company,
-                                "location": job.location,
-                                "apply_url": job.apply_url or ""
-                            }
-                        }])
-                        embedding_id = job_id
-                    except Exception as e:
-                        print(f"Pinecone indexing error: {e}")
-                
-                # Store in SQLite database
-                db_job = JobPostingDB(
-                    id=job_id,
-                    job_title=job.job_title,
-                    company=job.company,
-                    location=job.location,
-                    apply_url=job.apply_url or "",
-                    lat=job.lat,
-                    lng=job.lng,
-                    text=job.description,
-                    source="pipeline",
-                    scraped_at=datetime.utcnow(),
-                    embedding_id=embedding_id
-                )
-                
-                db.add(db_job)
-                indexed.append({
-                    "id": job_id,
-                    "job_title": job.job_title,
-                    "company": job.company,
-                    "location": job.location,
-                    "lat": job.lat,
-                    "lng": job.lng,
-                    "indexed_at": datetime.utcnow().isoformat()
-                })
+            texts = [
+                f"{job.job_title} at {job.company}. {job.description or ''}"
+                for job in jobs
+            ]
+            embeddings = await self.embeddings.aembed_documents(texts)
             
-            db.commit()
-            print(f"Indexed {len(indexed)} jobs to database")
+            vectors = [
+                {
+                    "id": job_id,
+                    "values": embedding,
+                    "metadata": {
+                        "job_title": job.job_title,
+                        "company": job.company,
+                        "location": job.location,
+                        "apply_url": job.apply_url or ""
+                    }
+                }
+                for job_id, embedding, job in zip(job_ids, embeddings, jobs)
+            ]
             
+            # Pinecone SDK is sync - upsert off the event loop
+            for i in range(0, len(vectors), self.UPSERT_BATCH_SIZE):
+                await asyncio.to_thread(
+                    self._upsert_batch,
+                    vectors[i:i + self.UPSERT_BATCH_SIZE]
+                )
+            return True
         except Exception as e:
-            print(f"Database error: {e}")
-            db.rollback()
-        finally:
-            db.close()
-        
-        return indexed
+            print(f"Pinecone indexing error: {e}")
+            return False
+
+    @retry(
+        retry=retry_if_exception(_is_retryable_pinecone_error),
+        wait=wait_random_exponential(min=1, max=30),
+        stop=stop_after_attempt(5),
+        reraise=True
+    )
+    def _upsert_batch(self, vectors: list[dict]):
+        """Upsert one batch of vectors, backing off on transient failures."""
+        self.pinecone_index.upsert(vectors=vectors)
+
+    async def _bulk_insert(self, rows: list[dict]) -> bool:
+        """Insert job rows with a single executemany INSERT."""
+        async with get_async_sessionmaker()() as db:
+            try:
+                await db.execute(JobPostingDB.__table__.insert(), rows)
+                await db.commit()
+                return True
+            except Exception as e:
+                print(f"Database error: {e}")
+                await db.rollback()
+                return False
+
+    async def _clear_embedding_ids(self, job_ids: list[str]):
+        """Reset embedding_id for jobs whose vectors failed to upsert."""
+        async with get_async_sessionmaker()() as db:
+            try:
+                await db.execute(
+                    update(JobPostingDB)
+                    .where(JobPostingDB.id.in_(job_ids))
+                    .values(embedding_id=None)
+                )
+                await db.commit()
+            except Exception as e:
+                print(f"Database error: {e}")
+                await db.rollback()
+
+
+@lru_cache()
+def get_indexing_agent() -> IndexingAgent:
+    """
+    Get cached Indexing Agent instance.
+    Avoids reconnecting to Pinecone for every pipeline.
+    """
+    return IndexingAgent()
 
 
 # Allow running directly for testing
 if __name__ == "__main__":
-    import asyncio
-    
     async def test():
         agent = IndexingAgent()
         test_jobs = [
@@ -1,19 +1,21 @@
 """
-Job Discovery Pipeline - LangGraph Orchestrator
-Coordinates all agents in a multi-step pipeline.
+Job Discovery Pipeline - Streaming Orchestrator
+Coordinates all agents in an overlapped multi-stage pipeline.
 """
 
-from typing import TypedDict, Annotated, Sequence
-from langgraph.graph import StateGraph, END
-from .web_search import WebSearchAgent
-from .scraper import ScraperAgent
-from .extraction import ExtractionAgent, ExtractedJob
-from .geocoding import GeocodingAgent, GeocodedJob
-from .indexing import IndexingAgent
+import asyncio
+from typing import TypedDict, Optional
+from .web_search import get_web_search_agent
+from .scraper import get_scraper_agent
+from .extraction import get_extraction_agent, ExtractedJob
+from .geocoding import get_geocoding_agent, GeocodedJob
+from .indexing import get_indexing_agent
+from .clients import close_clients
+from ..database import dispose_async_engine, init_db
 
 
 class PipelineState(TypedDict):
-    """State passed between pipeline nodes."""
+    """State collected across pipeline stages."""
     query: str
     search_results: list[dict]
     scraped_content: list[dict]
@@ -25,44 +27,38 @@ class PipelineState(TypedDict):
 
 class JobDiscoveryPipeline:
     """
-    LangGraph-based pipeline for autonomous job discovery.
-    
+    Streaming pipeline for autonomous job discovery.
+
     Flow:
     Query -> Web Search -> Scrape -> Extract -> Geocode -> Index
+
+    After the search, each stage runs as a pool of workers connected by
+    asyncio queues, so an item moves downstream as soon as it is ready.
+    Total latency approaches the slowest stage instead of the sum of stages.
+    A None sentinel on a queue tells one worker to stop.
     """
 
+    # Workers per stage (for extraction, batches extracted at once)
+    SCRAPE_WORKERS = 5
+    EXTRACT_WORKERS = 2
+    GEOCODE_WORKERS = 4
+
+    # Geocoded jobs buffered before each indexing flush
+    INDEX_BATCH_SIZE = 20
+
     def __init__(self):
-        self.web_search = WebSearchAgent()
-        self.scraper = ScraperAgent()
-        self.extraction = ExtractionAgent()
-        self.geocoding = GeocodingAgent()
-        self.indexing = IndexingAgent()
-        
-        self.graph = self._build_graph()
+        # Geocode cache and job tables must exist before workers start
+        init_db()
 
-    def _build_graph(self) -> StateGraph:
-        """Build the LangGraph workflow."""
-        workflow = StateGraph(PipelineState)
-        
-        # Add nodes
-        workflow.add_node("search", self._search_node)
-        workflow.add_node("scrape", self._scrape_node)
-        workflow.add_node("extract", self._extract_node)
-        workflow.add_node("geocode", self._geocode_node)
-        workflow.add_node("index", self._index_node)
-        
-        # Define edges
-        workflow.set_entry_point("search")
-        workflow.add_edge("search", "scrape")
-        workflow.add_edge("scrape", "extract")
-        workflow.add_edge("extract", "geocode")
-        workflow.add_edge("geocode", "index")
-        workflow.add_edge("index", END)
-        
-        return workflow.compile()
+        # Agents are process-wide singletons, so a pipeline is cheap to create
+        self.web_search = get_web_search_agent()
+        self.scraper = get_scraper_agent()
+        self.extraction = get_extraction_agent()
+        self.geocoding = get_geocoding_agent()
+        self.indexing = get_indexing_agent()
 
-    async def _search_node(self, state: PipelineState) -> PipelineState:
-        """Web Search Agent node."""
+    async def _search(self, state: PipelineState):
+        """Web Search Agent stage."""
         try:
             results = await self.web_search.run(
                 query=state.get("query"),
@@ -73,63 +69,139 @@ class JobDiscoveryPipeline:
         except Exception as e:
             state["error"] = f"Search error: {e}"
             state["search_results"] = []
-        return state
 
-    async def _scrape_node(self, state: PipelineState) -> PipelineState:
-        """Scraper Agent node."""
-        try:
-            results = await self.scraper.run(state["search_results"])
-            state["scraped_content"] = results
-            print(f"[Scrape] Scraped {len(results)} pages")
-        except Exception as e:
-            state["error"] = f"Scrape error: {e}"
-            state["scraped_content"] = []
-        return state
+    async def _scrape_worker(
+        self,
+        state: PipelineState,
+        in_queue: asyncio.Queue,
+        out_queue: asyncio.Queue
+    ):
+        """
+        Scraper Agent worker: (position, search result) -> (position, page).
+        Every position is passed on, with None for a failed page, so the
+        extraction stage knows when each of its batches is complete.
+        """
+        while (entry := await in_queue.get()) is not None:
+            index, item = entry
+            result = None
+            try:
+                result = await self.scraper.scrape_item(item)
+                if result:
+                    state["scraped_content"].append(result)
+            except Exception as e:
+                state["error"] = f"Scrape error: {e}"
+            await out_queue.put((index, result))
 
-    async def _extract_node(self, state: PipelineState) -> PipelineState:
-        """Extraction Agent node."""
-        try:
-            results = await self.extraction.run(state["scraped_content"])
-            state["extracted_jobs"] = results
-            print(f"[Extract] Extracted {len(results)} jobs")
-        except Exception as e:
-            state["error"] = f"Extraction error: {e}"
-            state["extracted_jobs"] = []
-        return state
+    async def _extract_worker(
+        self,
+        state: PipelineState,
+        in_queue: asyncio.Queue,
+        out_queue: asyncio.Queue
+    ):
+        """
+        Extraction Agent stage: scraped pages -> extracted jobs.
 
-    async def _geocode_node(self, state: PipelineState) -> PipelineState:
-        """Geocoding Agent node."""
-        try:
-            results = await self.geocoding.run(state["extracted_jobs"])
-            state["geocoded_jobs"] = results
-            print(f"[Geocode] Geocoded {len(results)} jobs")
-        except Exception as e:
-            state["error"] = f"Geocoding error: {e}"
-            state["geocoded_jobs"] = []
-        return state
+        Pages are grouped into fixed batches by search result position,
+        so the same results always produce the same prompts (and LLM cache
+        hits) however the scrapers happen to finish. Up to EXTRACT_WORKERS
+        batches are extracted at once.
+        """
+        batch_size = self.extraction.BATCH_SIZE
+        limit = asyncio.Semaphore(self.EXTRACT_WORKERS)
+        pending: dict[int, dict[int, Optional[dict]]] = {}
+        tasks = []
 
-    async def _index_node(self, state: PipelineState) -> PipelineState:
-        """Indexing Agent node."""
-        try:
-            results = await self.indexing.run(state["geocoded_jobs"])
-            state["indexed_jobs"] = results
-            print(f"[Index] Indexed {len(results)} jobs")
-        except Exception as e:
-            state["error"] = f"Indexing error: {e}"
-            state["indexed_jobs"] = []
-        return state
+        async def extract(batch: dict[int, Optional[dict]]):
+            pages = [batch[index] for index in sorted(batch) if batch[index]]
+            if not pages:
+                return
+            async with limit:
+                try:
+                    for job in await self.extraction.run(pages):
+                        state["extracted_jobs"].append(job)
+                        await out_queue.put(job)
+                except Exception as e:
+                    state["error"] = f"Extraction error: {e}"
+
+        while (entry := await in_queue.get()) is not None:
+            index, result = entry
+            batch = pending.setdefault(index // batch_size, {})
+            batch[index] = result
+            if len(batch) == batch_size:
+                tasks.append(asyncio.create_task(extract(pending.pop(index // batch_size))))
+
+        # Only the last, short batch can still be pending
+        tasks.extend(asyncio.create_task(extract(batch)) for batch in pending.values())
+        await asyncio.gather(*tasks)
+
+    async def _geocode_worker(
+        self,
+        state: PipelineState,
+        in_queue: asyncio.Queue,
+        out_queue: asyncio.Queue
+    ):
+        """Geocoding Agent worker: extracted job -> geocoded job."""
+        while (job := await in_queue.get()) is not None:
+            try:
+                geocoded = await self.geocoding.geocode_job(job)
+                state["geocoded_jobs"].append(geocoded)
+                await out_queue.put(geocoded)
+            except Exception as e:
+                state["error"] = f"Geocoding error: {e}"
+
+    async def _index_worker(
+        self,
+        state: PipelineState,
+        in_queue: asyncio.Queue,
+        out_queue: Optional[asyncio.Queue] = None
+    ):
+        """Indexing Agent worker: buffers geocoded jobs and indexes them in batches."""
+        buffer: list[GeocodedJob] = []
+
+        async def flush():
+            try:
+                state["indexed_jobs"].extend(await self.indexing.run(buffer))
+            except Exception as e:
+                state["error"] = f"Indexing error: {e}"
+            buffer.clear()
+
+        while (job := await in_queue.get()) is not None:
+            buffer.append(job)
+            if len(buffer) >= self.INDEX_BATCH_SIZE:
+                await flush()
+
+        if buffer:
+            await flush()
+
+    async def _run_stage(
+        self,
+        worker,
+        num_workers: int,
+        state: PipelineState,
+        in_queue: asyncio.Queue,
+        out_queue: Optional[asyncio.Queue] = None,
+        downstream_workers: int = 0
+    ):
+        """Run a pool of stage workers, then signal the next stage to stop."""
+        await asyncio.gather(*[
+            worker(state, in_queue, out_queue) for _ in range(num_workers)
+        ])
+
+        if out_queue is not None:
+            for _ in range(downstream_workers):
+                await out_queue.put(None)
 
     async def run(self, query: str = None) -> dict:
         """
         Run the full job discovery pipeline.
-        
+
         Args:
             query: Optional search query (uses defaults if None)
-            
+
         Returns:
             Final pipeline state with all results
         """
-        initial_state: PipelineState = {
+        state: PipelineState = {
             "query": query or "",
             "search_results": [],
             "scraped_content": [],
@@ -138,30 +210,75 @@ class JobDiscoveryPipeline:
             "indexed_jobs": [],
             "error": ""
         }
-        
+
         print(f"\n{'='*50}")
         print("Starting Job Discovery Pipeline")
         print(f"{'='*50}\n")
-        
-        final_state = await self.graph.ainvoke(initial_state)
-        
+
+        await self._search(state)
+
+        scrape_queue: asyncio.Queue = asyncio.Queue()
+        extract_queue: asyncio.Queue = asyncio.Queue()
+        geocode_queue: asyncio.Queue = asyncio.Queue()
+        index_queue: asyncio.Queue = asyncio.Queue()
+
+        for entry in enumerate(state["search_results"][:self.scraper.MAX_URLS]):
+            scrape_queue.put_nowait(entry)
+        for _ in range(self.SCRAPE_WORKERS):
+            scrape_queue.put_nowait(None)
+
+        await asyncio.gather(
+            self._run_stage(
+                self._scrape_worker, self.SCRAPE_WORKERS, state,
+                scrape_queue, extract_queue, 1
+            ),
+            self._run_stage(
+                self._extract_worker, 1, state,
+                extract_queue, geocode_queue, self.GEOCODE_WORKERS
+            ),
+            self._run_stage(
+                self._geocode_worker, self.GEOCODE_WORKERS, state,
+                geocode_queue, index_queue, 1
+            ),
+            self._run_stage(self._index_worker, 1, state, index_queue),
+        )
+
+        print(f"[Scrape] Scraped {len(state['scraped_content'])} pages")
+        print(f"[Extract] Extracted {len(state['extracted_jobs'])} jobs")
+        print(f"[Geocode] Geocoded {len(state['geocoded_jobs'])} jobs")
+        print(f"[Index] Indexed {len(state['indexed_jobs'])} jobs")
+
         print(f"\n{'='*50}")
-        print(f"Pipeline Complete: {len(final_state['indexed_jobs'])} jobs indexed")
+        print(f"Pipeline Complete: {len(state['indexed_jobs'])} jobs indexed")
         print(f"{'='*50}\n")
+
+        return state
+
+    async def close(self):
+        """
+        Release network resources held by the agents.
+        The pipeline can't be reused afterwards - create a new one, which
+        rebuilds the OpenAI-backed agents on fresh clients.
+        """
+        await self.scraper.close()
+        await self.geocoding.close()
+        await dispose_async_engine()
         
-        return final_state
+        # These agents hold OpenAI clients bound to the closed HTTP client
+        await close_clients()
+        get_extraction_agent.cache_clear()
+        get_indexing_agent.cache_clear()
 
 
 # Allow running directly for testing
 if __name__ == "__main__":
-    import asyncio
-    
     async def test():
         pipeline = JobDiscoveryPipeline()
         result = await pipeline.run("software engineer jobs Bangalore")
-        
+        await pipeline.close()
+
         print("\nFinal Results:")
         for job in result["indexed_jobs"]:
             print(f"  - {job['job_title']} at {job['company']}")
-    
+
     asyncio.run(test())
@@ -3,8 +3,11 @@ Agent 2: Scraper Agent
 Scrapes job content from URLs using existing scrapers.
 """
 
-import requests
-from bs4 import BeautifulSoup
+import asyncio
+import json
+import aiohttp
+from selectolax.lexbor import LexborHTMLParser
+from functools import lru_cache
 from typing import Optional
 from .base import BaseAgent
 
@@ -12,13 +15,50 @@ from .base import BaseAgent
 class ScraperAgent(BaseAgent):
     """
     Scrapes job posting content from URLs.
-    Uses requests + BeautifulSoup for simple HTML parsing.
+    Uses a shared aiohttp session + selectolax for fast HTML text extraction.
     """
 
     HEADERS = {
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
         "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
     }
+    
+    # Maximum URLs scraped per run
+    MAX_URLS = 10
+    
+    # Lines that mark the job-relevant parts of a page
+    JOB_KEYWORDS = (
+        "engineer", "developer", "role", "responsibilities", "requirements",
+        "qualifications", "experience", "skills", "salary", "location", "apply",
+    )
+    
+    # Leading lines always kept (page/job title), and lines kept after a keyword hit
+    HEADER_LINES = 5
+    CONTEXT_LINES = 3
+    
+    # Connection pool size and per-request timeout (seconds)
+    MAX_CONNECTIONS = 20
+    REQUEST_TIMEOUT = 15
+
+    def __init__(self):
+        # Created lazily - aiohttp sessions must be opened inside a running loop
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Get or create the shared HTTP session."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                headers=self.HEADERS,
+                connector=aiohttp.TCPConnector(limit=self.MAX_CONNECTIONS),
+                timeout=aiohttp.ClientTimeout(total=self.REQUEST_TIMEOUT)
+            )
+        return self._session
+
+    async def close(self):
+        """Close the shared HTTP session."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
 
     @property
     def name(self) -> str:
@@ -34,57 +74,146 @@ class ScraperAgent(BaseAgent):
         Returns:
             List of scraped content with text
         """
-        scraped = []
+        # Limit to prevent too many requests
+        results = await asyncio.gather(
+            *[self.scrape_item(item) for item in urls[:self.MAX_URLS]],
+            return_exceptions=True
+        )
         
-        for item in urls[:10]:  # Limit to prevent too many requests
-            url = item.get("url", "")
-            if not url:
-                continue
+        return [r for r in results if r and not isinstance(r, Exception)]
+
+    async def scrape_item(self, item: dict) -> Optional[dict]:
+        """
+        Scrape a single search result.
+        
+        Args:
+            item: Dict with 'url' key from Web Search Agent
             
-            content = await self._scrape_url(url)
-            if content:
-                scraped.append({
-                    "url": url,
-                    "title": item.get("title", ""),
-                    "snippet": item.get("snippet", ""),
-                    "content": content,
-                })
+        Returns:
+            Scraped content dict, or None if the page could not be scraped
+        """
+        url = item.get("url", "")
+        if not url:
+            return None
         
-        return scraped
+        page = await self._scrape_url(url)
+        if not page:
+            return None
+        
+        return {
+            "url": url,
+            "title": item.get("title", ""),
+            "snippet": item.get("snippet", ""),
+            **page,
+        }
 
-    async def _scrape_url(self, url: str) -> Optional[str]:
-        """Scrape text content from a single URL."""
+    async def _scrape_url(self, url: str) -> Optional[dict]:
+        """
+        Scrape a single URL.
+        
+        Returns:
+            Dict with 'content' text and 'job_posting' (schema.org JobPosting
+            JSON-LD if the page embeds one), or None if scraping failed
+        """
         try:
-            response = requests.get(url, headers=self.HEADERS, timeout=15)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, "lxml")
+            async with self._get_session().get(url) as response:
+                response.raise_for_status()
+                html = await response.text()
             
-            # Remove script and style elements
-            for element in soup(["script", "style", "nav", "footer", "header"]):
-                element.decompose()
+            # Parsing is CPU-bound - keep it off the event loop
+            text, job_posting = await asyncio.to_thread(self._parse_page, html)
             
-            # Get text content
-            text = soup.get_text(separator="\n", strip=True)
+            if not text:
+                return None
             
             # Limit text length
-            return text[:5000] if text else None
+            return {"content": text[:5000], "job_posting": job_posting}
             
         except Exception as e:
             print(f"Scrape error for {url}: {e}")
             return None
 
+    @classmethod
+    def _parse_page(cls, html: str) -> tuple[str, Optional[dict]]:
+        """Extract visible text and any JobPosting JSON-LD from an HTML document."""
+        tree = LexborHTMLParser(html)
+        
+        # Read structured data before scripts are stripped
+        job_posting = cls._find_job_posting(tree)
+        
+        # Remove script and style elements
+        for element in tree.css("script, style, nav, footer, header"):
+            element.decompose()
+        
+        # Get text content
+        text = tree.body.text(separator="\n", strip=True) if tree.body else ""
+        return cls._focus_job_content(text), job_posting
+
+    @staticmethod
+    def _find_job_posting(tree: LexborHTMLParser) -> Optional[dict]:
+        """Return the first schema.org JobPosting object embedded as JSON-LD."""
+        for script in tree.css('script[type="application/ld+json"]'):
+            try:
+                data = json.loads(script.text())
+            except ValueError:
+                continue
+            
+            # JSON-LD may be a single object, a list, or an @graph container
+            candidates = data if isinstance(data, list) else [data]
+            for candidate in candidates:
+                if not isinstance(candidate, dict):
+                    continue
+                for node in [candidate, *candidate.get("@graph", [])]:
+                    if not isinstance(node, dict):
+                        continue
+                    node_type = node.get("@type")
+                    types = node_type if isinstance(node_type, list) else [node_type]
+                    if "JobPosting" in types:
+                        return node
+        
+        return None
+
+    @classmethod
+    def _focus_job_content(cls, text: str) -> str:
+        """
+        Keep the title lines plus the lines around job keywords, dropping
+        boilerplate so fewer tokens are sent to the extraction LLM.
+        Returns the text unchanged if no keywords are found.
+        """
+        lines = text.split("\n")
+        kept = lines[:cls.HEADER_LINES]
+        keep_until = 0
+        found = False
+        
+        for i in range(cls.HEADER_LINES, len(lines)):
+            line_lower = lines[i].lower()
+            if any(keyword in line_lower for keyword in cls.JOB_KEYWORDS):
+                keep_until = i + cls.CONTEXT_LINES
+                found = True
+            if i <= keep_until:
+                kept.append(lines[i])
+        
+        return "\n".join(kept) if found else text
+
+
+@lru_cache()
+def get_scraper_agent() -> ScraperAgent:
+    """
+    Get cached Scraper Agent instance.
+    The shared aiohttp session keeps connections warm between runs.
+    """
+    return ScraperAgent()
+
 
 # Allow running directly for testing
 if __name__ == "__main__":
-    import asyncio
-    
     async def test():
         agent = ScraperAgent()
         test_urls = [
             {"url": "https://remoteok.com/remote-jobs", "title": "RemoteOK Jobs"}
         ]
         results = await agent.run(test_urls)
+        await agent.close()
         
         print(f"\nScraped {len(results)} pages:\n")
         for r in results:
@@ -3,6 +3,8 @@ Agent 1: Web Search Agent
 Searches for job pages in India using DuckDuckGo.
 """
 
+import asyncio
+from functools import lru_cache
 from typing import Optional
 from duckduckgo_search import DDGS
 from .base import BaseAgent
@@ -42,44 +44,54 @@ class WebSearchAgent(BaseAgent):
         Returns:
             List of search results with title, url, body
         """
-        results = []
         queries = [query] if query else self.DEFAULT_QUERIES[:2]  # Limit for rate limiting
         
-        with DDGS() as ddgs:
-            for q in queries:
-                try:
-                    search_results = list(ddgs.text(
-                        q,
-                        region="in-en",  # India, English
-                        max_results=max_results
-                    ))
-                    
-                    for result in search_results:
-                        results.append({
-                            "title": result.get("title", ""),
-                            "url": result.get("href", ""),
-                            "snippet": result.get("body", ""),
-                            "source_query": q
-                        })
-                except Exception as e:
-                    print(f"Search error for '{q}': {e}")
-                    continue
+        # DDGS is blocking - run each query in its own thread
+        per_query = await asyncio.gather(
+            *[asyncio.to_thread(self._search, q, max_results) for q in queries],
+            return_exceptions=True
+        )
+        
+        # Keyed by URL to drop duplicates as results are collected
+        results_by_url: dict[str, dict] = {}
         
-        # Remove duplicates by URL
-        seen_urls = set()
-        unique_results = []
-        for r in results:
-            if r["url"] not in seen_urls:
-                seen_urls.add(r["url"])
-                unique_results.append(r)
+        for q, search_results in zip(queries, per_query):
+            if isinstance(search_results, Exception):
+                print(f"Search error for '{q}': {search_results}")
+                continue
+            
+            for result in search_results:
+                url = result.get("href", "")
+                if url not in results_by_url:
+                    results_by_url[url] = {
+                        "title": result.get("title", ""),
+                        "url": url,
+                        "snippet": result.get("body", ""),
+                        "source_query": q
+                    }
         
-        return unique_results
+        return list(results_by_url.values())
+
+    @staticmethod
+    def _search(query: str, max_results: int) -> list[dict]:
+        """Run a single DuckDuckGo search (blocking)."""
+        # One DDGS client per call - it is not safe to share across threads
+        with DDGS() as ddgs:
+            return list(ddgs.text(
+                query,
+                region="in-en",  # India, English
+                max_results=max_results
+            ))
+
+
+@lru_cache()
+def get_web_search_agent() -> WebSearchAgent:
+    """Get cached Web Search Agent instance."""
+    return WebSearchAgent()
 
 
 # Allow running directly for testing
 if __name__ == "__main__":
-    import asyncio
-    
     async def test():
         agent = WebSearchAgent()
         results = await agent.run(max_results=5)
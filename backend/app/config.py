@@ -27,6 +27,13 @@ class Settings(BaseSettings):
     # Database
     database_url: str = "sqlite:///./jobs.db"
     
+    # LLM response cache (Redis is used when redis_url is set)
+    llm_cache_path: str = ".langchain_cache.db"
+    redis_url: Optional[str] = None
+    
+    # On-disk cache of OpenAI embeddings
+    embedding_cache_path: str = ".embedding_cache.db"
+    
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
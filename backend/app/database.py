@@ -3,11 +3,14 @@ Database configuration and session management.
 Uses SQLite for development - can be migrated to PostgreSQL later.
 """
 
-from sqlalchemy import create_engine
+from functools import lru_cache
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 
 # SQLite database file path
 SQLITE_DATABASE_URL = "sqlite:///./jobs.db"
+ASYNC_SQLITE_DATABASE_URL = "sqlite+aiosqlite:///./jobs.db"
 
 # Create engine with SQLite-specific settings
 engine = create_engine(
@@ -15,9 +18,50 @@ engine = create_engine(
     connect_args={"check_same_thread": False}  # Required for SQLite with FastAPI
 )
 
-# Session factory
+
+@event.listens_for(engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    Enable WAL journaling so readers don't block writers, and relax fsync
+    to once per checkpoint (still crash-safe in WAL mode).
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.close()
+
+
+# Session factories
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+
+@lru_cache()
+def get_async_engine() -> AsyncEngine:
+    """
+    Get the async engine for writes from async code (e.g. the indexing agent).
+    Created on first use so importing this module doesn't need aiosqlite.
+    """
+    async_engine = create_async_engine(ASYNC_SQLITE_DATABASE_URL)
+    event.listen(async_engine.sync_engine, "connect", _set_sqlite_pragmas)
+    return async_engine
+
+
+@lru_cache()
+def get_async_sessionmaker() -> async_sessionmaker:
+    """Get the session factory bound to the async engine."""
+    return async_sessionmaker(get_async_engine(), expire_on_commit=False)
+
+
+async def dispose_async_engine():
+    """
+    Close pooled aiosqlite connections. They belong to the event loop that
+    opened them, so the next loop gets a fresh engine.
+    """
+    if get_async_engine.cache_info().currsize:
+        await get_async_engine().dispose()
+    get_async_sessionmaker.cache_clear()
+    get_async_engine.cache_clear()
+
 # Base class for ORM models
 Base = declarative_base()
 
@@ -41,3 +85,7 @@ def init_db():
     """
     from . import db_models  # Import to register models
     Base.metadata.create_all(bind=engine)
+    
+    # Nothing queried the old coordinate R-tree; drop it from existing databases
+    with engine.begin() as conn:
+        conn.execute(text("DROP TABLE IF EXISTS job_rtree"))
@@ -3,7 +3,7 @@ SQLAlchemy ORM models for database persistence.
 """
 
 from datetime import datetime
-from sqlalchemy import Column, String, Float, Text, DateTime
+from sqlalchemy import Column, String, Float, Text, DateTime, Boolean, Index
 from .database import Base
 import uuid
 
@@ -13,11 +13,15 @@ class JobPostingDB(Base):
     SQLAlchemy model for job postings stored in the database.
     """
     __tablename__ = "job_postings"
+    __table_args__ = (
+        # Covers company-only and company + location lookups with one B-tree
+        Index("ix_company_location", "company", "location"),
+    )
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    job_title = Column(String(255), nullable=False, index=True)
-    company = Column(String(255), nullable=False, index=True)
-    location = Column(String(255), nullable=False, index=True)
+    job_title = Column(String(255), nullable=False)
+    company = Column(String(255), nullable=False)
+    location = Column(String(255), nullable=False)
     apply_url = Column(String(500), nullable=False)
     lat = Column(Float, nullable=False)
     lng = Column(Float, nullable=False)
@@ -30,3 +34,20 @@ class JobPostingDB(Base):
 
     def __repr__(self):
         return f"<JobPosting {self.job_title} at {self.company}>"
+
+
+class GeocodeCacheDB(Base):
+    """
+    Persistent cache of Nominatim lookups, keyed by normalized location.
+    Misses are stored too (found=False) so junk strings aren't retried every run.
+    """
+    __tablename__ = "geocode_cache"
+
+    location = Column(String(255), primary_key=True)
+    lat = Column(Float, nullable=False)
+    lng = Column(Float, nullable=False)
+    found = Column(Boolean, nullable=False, default=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<GeocodeCache {self.location} -> ({self.lat}, {self.lng})>"
@@ -0,0 +1,65 @@
+"""
+Embedding Cache - on-disk cache of OpenAI embeddings.
+Re-indexing unchanged text reads vectors from SQLite instead of calling OpenAI.
+"""
+
+import hashlib
+import sqlite3
+import threading
+from typing import Optional
+import numpy as np
+
+# Stay below SQLite's default limit of 999 bound parameters per statement
+_MAX_LOOKUP = 500
+
+
+class EmbeddingCache:
+    """
+    SQLite table of embeddings keyed by SHA-256 of model, dimension and text.
+    Vectors are stored as float16 blobs, half the size of float32, which is
+    well within what cosine search can tell apart.
+    """
+
+    def __init__(self, path: str, model: str, dimension: int):
+        self.model = model
+        self.dimension = dimension
+        self._lock = threading.Lock()
+        # Shared by FastAPI's threadpool workers, serialized by the lock
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings (sha256 TEXT PRIMARY KEY, vec BLOB NOT NULL)"
+            )
+
+    def _key(self, text: str) -> str:
+        return hashlib.sha256(f"{self.model}:{self.dimension}:{text}".encode("utf-8")).hexdigest()
+
+    def get_many(self, texts: list[str]) -> list[Optional[list[float]]]:
+        """Look up cached embeddings, with None for each miss."""
+        keys = [self._key(text) for text in texts]
+        found: dict[str, bytes] = {}
+        with self._lock:
+            for i in range(0, len(keys), _MAX_LOOKUP):
+                batch = keys[i:i + _MAX_LOOKUP]
+                rows = self._conn.execute(
+                    f"SELECT sha256, vec FROM embeddings WHERE sha256 IN ({','.join('?' * len(batch))})",
+                    batch
+                )
+                found.update(rows)
+
+        return [
+            np.frombuffer(found[key], dtype=np.float16).astype(np.float32).tolist()
+            if key in found else None
+            for key in keys
+        ]
+
+    def put_many(self, texts: list[str], embeddings: list[list[float]]):
+        """Store embeddings in a single transaction."""
+        rows = [
+            (self._key(text), np.asarray(embedding, dtype=np.float16).tobytes())
+            for text, embedding in zip(texts, embeddings)
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (sha256, vec) VALUES (?, ?)", rows
+            )
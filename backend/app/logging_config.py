@@ -0,0 +1,34 @@
+"""
+Logging setup for the app's entry points (the API server and scripts).
+Library modules only create loggers; handlers and levels are set here once.
+"""
+
+import logging
+import sys
+from logging.handlers import MemoryHandler
+
+# Messages are capped so an error echoing a response body stays one line
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message).200s"
+
+
+def configure_logging(buffered: bool = False):
+    """
+    Write log records to stderr: INFO and up from the app, WARNING and up
+    from everything else.
+
+    Args:
+        buffered: Write records in batches of 100, errors immediately.
+            Scraper runs log a warning per failed URL or listing, so
+            scraping scripts pass True; logging flushes the rest at exit.
+    """
+    root = logging.getLogger()
+    if root.handlers:
+        return  # Already configured, e.g. by a test runner
+
+    handler: logging.Handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    if buffered:
+        handler = MemoryHandler(capacity=100, flushLevel=logging.ERROR, target=handler)
+
+    root.addHandler(handler)
+    logging.getLogger("app").setLevel(logging.INFO)
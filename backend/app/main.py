@@ -5,19 +5,58 @@ Main application entry point with CORS configuration
 for frontend communication.
 """
 
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi_cache import FastAPICache
 
+from .agents.clients import close_clients
 from .routers import pins, search
+from .config import get_settings
 from .database import init_db
+from .logging_config import configure_logging
+from .vectorstore import VectorStore
+
+
+def _init_response_cache():
+    """
+    Set up the response cache for cached routes.
+    Redis shares entries across workers and reloads; without it each
+    process keeps its own in-memory cache.
+    """
+    settings = get_settings()
+    if settings.redis_url:
+        from redis import asyncio as aioredis
+        from fastapi_cache.backends.redis import RedisBackend
+        backend = RedisBackend(aioredis.from_url(settings.redis_url))
+    else:
+        from fastapi_cache.backends.inmemory import InMemoryBackend
+        backend = InMemoryBackend()
+    
+    FastAPICache.init(backend, prefix="jobmap")
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Application lifespan handler - initializes database on startup."""
+    """Application lifespan handler - initializes database, caches and vector store on startup."""
+    configure_logging()
+    
+    # Blocking Pinecone/OpenAI calls run here via asyncio.to_thread; the
+    # stock pool (min(32, cpus + 4) threads) is too small on small machines
+    executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix="pinecone")
+    asyncio.get_running_loop().set_default_executor(executor)
+    
     init_db()
+    _init_response_cache()
+    # Connect to Pinecone (and create the index) before the first request
+    app.state.vectorstore = VectorStore()
     yield
+    
+    # Shared OpenAI HTTP client, if anything on this loop opened it
+    await close_clients()
+    executor.shutdown(wait=False)
 
 
 # Create FastAPI application
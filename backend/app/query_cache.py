@@ -0,0 +1,158 @@
+"""
+Query Cache - in-process caches for semantic search results.
+Repeated searches skip both the embedding call and the Pinecone query;
+near-duplicate searches still embed but skip the Pinecone query.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+import numpy as np
+
+
+class QueryCache:
+    """
+    Thread-safe LRU cache with a per-entry time-to-live.
+    """
+
+    def __init__(self, max_size: int = 2000, ttl_seconds: float = 300):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def make_key(*parts) -> str:
+        """Hash the query parameters into a compact cache key."""
+        return hashlib.blake2b(repr(parts).encode("utf-8"), digest_size=16).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None if it's missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() - entry[0] > self.ttl_seconds:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: str, value: Any):
+        """Store a value, evicting the least recently used entry when full."""
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self):
+        """Drop every entry, e.g. after the index changes."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Get hit/miss counters and current size."""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses
+            }
+
+
+class SemanticQueryCache:
+    """
+    Cache keyed by query embedding, so differently worded queries that
+    embed to nearly the same vector share results.
+
+    Embeddings are L2-normalized and quantized to int8 with a per-row
+    scale on insert, so a single integer matrix product gives the cosine
+    similarity against every cached query (to within ~0.01). Slots are
+    reused in FIFO order once the cache is full.
+    """
+
+    def __init__(
+        self,
+        dimension: int,
+        max_size: int = 1024,
+        threshold: float = 0.97,
+        ttl_seconds: float = 300
+    ):
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._vectors = np.zeros((max_size, dimension), dtype=np.int8)
+        self._scales = np.zeros(max_size, dtype=np.float32)
+        self._timestamps = np.full(max_size, -np.inf)
+        self._entries: list[Optional[tuple[Any, Any]]] = [None] * max_size
+        self._next = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _quantize(embedding) -> tuple[np.ndarray, float]:
+        """L2-normalize a vector and quantize it to int8 plus a scale."""
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        if norm:
+            vector = vector / norm
+        scale = float(np.abs(vector).max()) / 127 or 1.0
+        return np.round(vector / scale).astype(np.int8), scale
+
+    def get(self, embedding, params: Any) -> Optional[Any]:
+        """
+        Return results cached for the most similar live query embedding,
+        or None if none is above the threshold or its params differ.
+        """
+        vector, scale = self._quantize(embedding)
+        with self._lock:
+            # Accumulate in int32; int8 products would overflow
+            dots = np.matmul(self._vectors, vector, dtype=np.int32)
+            scores = dots * self._scales * scale
+            # Expired and empty slots can never match
+            scores[time.monotonic() - self._timestamps > self.ttl_seconds] = -1.0
+
+            # Usually zero or one candidate clears the threshold
+            candidates = np.flatnonzero(scores >= self.threshold)
+            for slot in candidates[np.argsort(-scores[candidates])]:
+                entry = self._entries[slot]
+                if entry is not None and entry[0] == params:
+                    self.hits += 1
+                    return entry[1]
+
+            self.misses += 1
+            return None
+
+    def put(self, embedding, params: Any, value: Any):
+        """Store results for a query embedding, overwriting the oldest slot."""
+        vector, scale = self._quantize(embedding)
+        with self._lock:
+            slot = self._next
+            self._vectors[slot] = vector
+            self._scales[slot] = scale
+            self._timestamps[slot] = time.monotonic()
+            self._entries[slot] = (params, value)
+            self._next = (slot + 1) % len(self._entries)
+
+    def invalidate(self):
+        """Drop every entry, e.g. after the index changes."""
+        with self._lock:
+            self._timestamps.fill(-np.inf)
+            self._entries = [None] * len(self._entries)
+            self._next = 0
+
+    def stats(self) -> dict:
+        """Get hit/miss counters and current size."""
+        with self._lock:
+            return {
+                "size": sum(entry is not None for entry in self._entries),
+                "hits": self.hits,
+                "misses": self.misses
+            }
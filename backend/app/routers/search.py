@@ -2,27 +2,62 @@
 Search router - Semantic job search using Pinecone.
 """
 
-from fastapi import APIRouter, Query
-from pydantic import BaseModel
+import asyncio
+import hashlib
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi_cache import FastAPICache
+from fastapi_cache.decorator import cache
+from pydantic import BaseModel, Field, TypeAdapter
 from typing import Optional
-from ..vectorstore import get_vector_store
+from ..vectorstore import VectorStore
 
 router = APIRouter(prefix="/search", tags=["search"])
 
+# Response cache namespace for everything that depends on index contents
+CACHE_NAMESPACE = "search"
+
+
+def _cache_key_builder(func, namespace: str = "", *, request=None, response=None, args=(), kwargs=None) -> str:
+    """
+    Build a response cache key from the route's query parameters.
+    The query is case- and whitespace-normalized so trivial variants share
+    an entry; injected objects (requests, dependencies) are left out.
+    fastapi-cache passes namespace already prefixed, so keys match what
+    FastAPICache.clear(namespace=...) deletes.
+    """
+    params = {
+        key: value for key, value in (kwargs or {}).items()
+        if isinstance(value, (str, int, float, bool, type(None)))
+    }
+    if isinstance(params.get("q"), str):
+        params["q"] = params["q"].strip().lower()
+    
+    raw = f"{func.__module__}:{func.__name__}:{sorted(params.items())}"
+    return f"{namespace}:{hashlib.md5(raw.encode()).hexdigest()}"
+
+
+def get_vector_store(request: Request) -> VectorStore:
+    """Dependency returning the vector store created at app startup."""
+    return request.app.state.vectorstore
+
 
 class SearchResult(BaseModel):
-    """Individual search result."""
-    id: str
-    score: float
-    job_title: str
-    company: str
-    location: str
-    apply_url: str
-    lat: float
-    lng: float
+    """Individual search result, validated straight from Pinecone match dicts."""
+    id: str = ""
+    score: float = 0.0
+    job_title: str = ""
+    company: str = ""
+    location: str = ""
+    apply_url: str = ""
+    lat: float = 20.5937  # Default to India center
+    lng: float = 78.9629
     text: Optional[str] = None
 
 
+# Validates a whole result list in one call instead of per-field in Python
+_SR_ADAPTER = TypeAdapter(list[SearchResult])
+
+
 class SearchResponse(BaseModel):
     """Response from search endpoint."""
     query: str
@@ -30,11 +65,42 @@ class SearchResponse(BaseModel):
     total: int
 
 
+class BatchSearchRequest(BaseModel):
+    """Several searches to run in one request."""
+    queries: list[str] = Field(..., min_length=1, max_length=20)
+    limit: int = Field(10, ge=1, le=50, description="Maximum results per query")
+    locations: Optional[list[Optional[str]]] = Field(
+        None, description="Optional location filter per query, same order as queries"
+    )
+
+
+class BatchSearchResponse(BaseModel):
+    """Response from batch search endpoint, one entry per query."""
+    searches: list[SearchResponse]
+
+
+@cache(expire=300, namespace=CACHE_NAMESPACE, key_builder=_cache_key_builder)
+async def _cached_search(q: str, limit: int, location: Optional[str], vs: VectorStore) -> list[dict]:
+    """
+    Raw matches for a search, cached by normalized query.
+    Only the results are cached, so a hit never echoes another caller's query.
+    Call with keyword arguments - the key builder only reads kwargs.
+    """
+    # The Pinecone and OpenAI clients are blocking; keep them off the event loop
+    return await asyncio.to_thread(
+        vs.semantic_search,
+        query=q,
+        top_k=limit,
+        location_filter=location
+    )
+
+
 @router.get("", response_model=SearchResponse)
 async def semantic_search(
     q: str = Query(..., description="Search query, e.g., 'software developer Bangalore'"),
     limit: int = Query(10, ge=1, le=50, description="Maximum results to return"),
-    location: Optional[str] = Query(None, description="Filter by location")
+    location: Optional[str] = Query(None, description="Filter by location"),
+    vs: VectorStore = Depends(get_vector_store)
 ):
     """
     Semantic search for jobs.
@@ -44,27 +110,9 @@ async def semantic_search(
     - "jobs in Bangalore"
     - "data analyst remote"
     """
-    vs = get_vector_store()
-    
-    raw_results = vs.semantic_search(
-        query=q,
-        top_k=limit,
-        location_filter=location
-    )
+    raw_results = await _cached_search(q=q, limit=limit, location=location, vs=vs)
     
-    results = []
-    for r in raw_results:
-        results.append(SearchResult(
-            id=r.get("id", ""),
-            score=r.get("score", 0.0),
-            job_title=r.get("job_title", ""),
-            company=r.get("company", ""),
-            location=r.get("location", ""),
-            apply_url=r.get("apply_url", ""),
-            lat=float(r.get("lat", 20.5937)),
-            lng=float(r.get("lng", 78.9629)),
-            text=r.get("text")
-        ))
+    results = _SR_ADAPTER.validate_python(raw_results)
     
     return SearchResponse(
         query=q,
@@ -73,14 +121,43 @@ async def semantic_search(
     )
 
 
+@router.post("/batch", response_model=BatchSearchResponse)
+async def semantic_search_batch(
+    request: BatchSearchRequest,
+    vs: VectorStore = Depends(get_vector_store)
+):
+    """
+    Run several semantic searches at once, e.g. one role across many cities.
+    Queries share one embeddings request and run concurrently in Pinecone.
+    """
+    if request.locations is not None and len(request.locations) != len(request.queries):
+        raise HTTPException(status_code=422, detail="locations must match queries in length")
+    
+    raw_batches = await asyncio.to_thread(
+        vs.semantic_search_batch,
+        queries=request.queries,
+        top_k=request.limit,
+        location_filters=request.locations
+    )
+    
+    searches = []
+    for query, raw_results in zip(request.queries, raw_batches):
+        results = _SR_ADAPTER.validate_python(raw_results)
+        searches.append(SearchResponse(query=query, results=results, total=len(results)))
+    
+    return BatchSearchResponse(searches=searches)
+
+
 @router.post("/index-sample")
-async def index_sample_jobs():
+async def index_sample_jobs(vs: VectorStore = Depends(get_vector_store)):
     """
     Index sample jobs from /pins endpoint into Pinecone.
     Call this once to populate the vector store.
     """
-    vs = get_vector_store()
-    count = vs.index_sample_jobs()
+    count = await asyncio.to_thread(vs.index_sample_jobs)
+    
+    # Cached searches and stats predate the new vectors
+    await FastAPICache.clear(namespace=CACHE_NAMESPACE)
     
     return {
         "message": f"Indexed {count} sample jobs",
@@ -89,7 +166,7 @@ async def index_sample_jobs():
 
 
 @router.get("/stats")
-async def get_stats():
+@cache(expire=60, namespace=CACHE_NAMESPACE, key_builder=_cache_key_builder)
+async def get_stats(vs: VectorStore = Depends(get_vector_store)):
     """Get Pinecone index statistics."""
-    vs = get_vector_store()
-    return vs.get_index_stats()
+    return await asyncio.to_thread(vs.get_index_stats)
@@ -1,13 +1,28 @@
 """
-Base scraper class with common HTTP handling and error management.
+Base scraper classes with common HTTP handling and error management.
+BaseScraper fetches sequentially; AsyncBaseScraper fetches concurrently.
+
+Trust boundary: scrapers build JobPostingCreate with model_construct(),
+skipping Pydantic validation, so every scraper must coerce its fields to
+the declared types itself. Data arriving through the API is validated.
 """
 
+import asyncio
+import logging
 import time
+import httpx
+import orjson
 import requests
 from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
 from typing import Optional
+from aiolimiter import AsyncLimiter
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from ..models import JobPostingCreate
 
+logger = logging.getLogger(__name__)
+
 
 class BaseScraper(ABC):
     """
@@ -20,6 +35,8 @@ class BaseScraper(ABC):
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
         "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
         "Accept-Language": "en-US,en;q=0.5",
+        # No "br": requests can only decode brotli when brotli is installed
+        "Accept-Encoding": "gzip, deflate",
         "Connection": "keep-alive",
     }
 
@@ -31,15 +48,31 @@ class BaseScraper(ABC):
             rate_limit: Minimum seconds between requests
         """
         self.rate_limit = rate_limit
-        self.last_request_time: float = 0
+        # time.monotonic() of the last request, immune to wall-clock jumps
+        self.last_request_time: float = float("-inf")
         self.session = requests.Session()
         self.session.headers.update(self.DEFAULT_HEADERS)
+        
+        # Keep connections to each host alive and retry transient failures
+        adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=20,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=[429, 500, 502, 503, 504]
+            )
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
 
     def _wait_for_rate_limit(self):
-        """Ensure we don't exceed rate limit."""
-        elapsed = time.time() - self.last_request_time
-        if elapsed < self.rate_limit:
-            time.sleep(self.rate_limit - elapsed)
+        """Ensure we don't exceed rate limit, and start timing this request."""
+        delay = self.rate_limit - (time.monotonic() - self.last_request_time)
+        if delay > 0:
+            time.sleep(delay)
+        # Failed requests count against the limit too
+        self.last_request_time = time.monotonic()
 
     def fetch(self, url: str, headers: Optional[dict] = None) -> Optional[str]:
         """
@@ -61,10 +94,9 @@ class BaseScraper(ABC):
                 timeout=30
             )
             response.raise_for_status()
-            self.last_request_time = time.time()
             return response.text
         except requests.RequestException as e:
-            print(f"Error fetching {url}: {e}")
+            logger.warning("Error fetching %s: %s", url, e)
             return None
 
     def fetch_json(self, url: str, headers: Optional[dict] = None) -> Optional[dict]:
@@ -87,10 +119,13 @@ class BaseScraper(ABC):
                 timeout=30
             )
             response.raise_for_status()
-            self.last_request_time = time.time()
-            return response.json()
+            # Parse the raw bytes; response.json() would decode to str first
+            return orjson.loads(response.content)
         except requests.RequestException as e:
-            print(f"Error fetching {url}: {e}")
+            logger.warning("Error fetching %s: %s", url, e)
+            return None
+        except orjson.JSONDecodeError as e:
+            logger.warning("Error decoding %s: %s", url, e)
             return None
 
     @property
@@ -108,3 +143,119 @@ class BaseScraper(ABC):
             List of JobPostingCreate objects
         """
         pass
+
+
+class AsyncBaseScraper(ABC):
+    """
+    Abstract base class for scrapers that fetch many URLs concurrently.
+    Requests share one HTTP/2 client and are bounded by both a concurrency
+    limit and a requests-per-second token bucket.
+    """
+
+    # HTTP/2 forbids connection-specific headers like "Connection"
+    DEFAULT_HEADERS = {
+        key: value for key, value in BaseScraper.DEFAULT_HEADERS.items()
+        if key != "Connection"
+    }
+
+    def __init__(self, requests_per_second: float = 1.0, concurrency: int = 10):
+        """
+        Initialize the scraper.
+        
+        Args:
+            requests_per_second: Maximum request rate; the default matches
+                BaseScraper's one request per second
+            concurrency: Maximum requests in flight at once
+        """
+        self.requests_per_second = requests_per_second
+        self.concurrency = concurrency
+        self.client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._limiter: Optional[AsyncLimiter] = None
+
+    @asynccontextmanager
+    async def _open(self):
+        """
+        Open the HTTP client and limits for one scrape run.
+        They're created inside the running event loop, so the sync
+        scrape() wrapper can start a fresh loop each time.
+        """
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._limiter = AsyncLimiter(self.requests_per_second, 1)
+        async with httpx.AsyncClient(
+            headers=self.DEFAULT_HEADERS,
+            timeout=30,
+            http2=True
+        ) as client:
+            self.client = client
+            try:
+                yield client
+            finally:
+                self.client = None
+
+    async def fetch(self, url: str, headers: Optional[dict] = None) -> Optional[str]:
+        """
+        Fetch content from a URL.
+        
+        Args:
+            url: URL to fetch
+            headers: Optional additional headers
+            
+        Returns:
+            HTML content or None if failed
+        """
+        response = await self._get(url, headers)
+        return response.text if response is not None else None
+
+    async def fetch_json(self, url: str, headers: Optional[dict] = None) -> Optional[dict]:
+        """
+        Fetch JSON content from a URL.
+        
+        Args:
+            url: URL to fetch
+            headers: Optional additional headers
+            
+        Returns:
+            JSON data or None if failed
+        """
+        response = await self._get(url, headers)
+        try:
+            return orjson.loads(response.content) if response is not None else None
+        except orjson.JSONDecodeError as e:
+            logger.warning("Error decoding %s: %s", url, e)
+            return None
+
+    async def _get(self, url: str, headers: Optional[dict] = None) -> Optional[httpx.Response]:
+        """GET a URL within the concurrency and rate limits."""
+        async with self._semaphore, self._limiter:
+            try:
+                response = await self.client.get(url, headers=headers)
+                response.raise_for_status()
+                return response
+            except httpx.HTTPError as e:
+                logger.warning("Error fetching %s: %s", url, e)
+                return None
+
+    @property
+    @abstractmethod
+    def source_name(self) -> str:
+        """Return the name of this scraper's source."""
+        pass
+
+    @abstractmethod
+    async def ascrape(self) -> list[JobPostingCreate]:
+        """
+        Scrape job postings from the source.
+        Implementations run inside ``async with self._open():``.
+        
+        Returns:
+            List of JobPostingCreate objects
+        """
+        pass
+
+    def scrape(self, *args, **kwargs) -> list[JobPostingCreate]:
+        """
+        Blocking wrapper around ascrape() for scripts and the CLI.
+        Code already inside an event loop must await ascrape() instead.
+        """
+        return asyncio.run(self.ascrape(*args, **kwargs))
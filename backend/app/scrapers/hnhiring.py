@@ -3,13 +3,36 @@ Hacker News "Who's Hiring" thread scraper.
 Scrapes job postings from monthly HN hiring threads.
 """
 
+import asyncio
+import html
+import logging
 import re
-from bs4 import BeautifulSoup
-from .base import BaseScraper
+from .base import AsyncBaseScraper
 from ..models import JobPostingCreate
 
+logger = logging.getLogger(__name__)
 
-class HNHiringScraper(BaseScraper):
+# Everything after "|" or "-", plus parenthesized asides, in one pass
+_RE_CLEANUP = re.compile(r'\s*[|-].*|\(.*?\)')
+
+# HN comment markup is only <p>, <a>, <i>, <pre> and <code>
+_RE_PARAGRAPH = re.compile(r'<p>', re.IGNORECASE)
+_TAG_RE = re.compile(r'<[^>]+>')
+
+_RE_URL = re.compile(r'https?://[^\s<>"{}|\\^`\[\]]+')
+
+# Common location patterns, most specific first
+_LOC_PATTERNS = [
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in (
+        r'(?:Location|Based in|Office in)[:\s]+([^|\n]+)',
+        r'(Remote|On-?site|Hybrid)',
+        r'(San Francisco|New York|London|Berlin|India|Bangalore|Mumbai|Delhi)',
+    )
+]
+
+
+class HNHiringScraper(AsyncBaseScraper):
     """
     Scraper for Hacker News "Who's Hiring" monthly threads.
     These threads contain real job postings from tech companies.
@@ -22,6 +45,15 @@ class HNHiringScraper(BaseScraper):
     # Default to a recent hiring thread
     DEFAULT_THREAD_ID = 42575537  # December 2024 Who's Hiring
 
+    # The HN Firebase API documents no rate limit ("There is currently no
+    # rate limit", https://github.com/HackerNews/API), so comments are
+    # fetched well above the base class's one request per second while
+    # staying gentle on a free public API
+    REQUESTS_PER_SECOND = 20
+
+    def __init__(self, requests_per_second: float = REQUESTS_PER_SECOND, concurrency: int = 10):
+        super().__init__(requests_per_second=requests_per_second, concurrency=concurrency)
+
     @property
     def source_name(self) -> str:
         return "hackernews"
@@ -32,12 +64,10 @@ class HNHiringScraper(BaseScraper):
             return "Unknown Company"
         
         # First line usually has company name
-        first_line = text.split('\n')[0].strip()
+        first_line = text.partition('\n')[0].strip()
         
         # Remove common patterns
-        first_line = re.sub(r'\s*\|.*', '', first_line)  # Remove after |
-        first_line = re.sub(r'\s*-.*', '', first_line)   # Remove after -
-        first_line = re.sub(r'\(.*?\)', '', first_line)  # Remove parentheses
+        first_line = _RE_CLEANUP.sub('', first_line)
         
         return first_line[:100] if first_line else "Unknown Company"
 
@@ -46,15 +76,8 @@ class HNHiringScraper(BaseScraper):
         if not text:
             return "Remote"
         
-        # Common location patterns
-        location_patterns = [
-            r'(?:Location|Based in|Office in)[:\s]+([^|\n]+)',
-            r'(Remote|On-?site|Hybrid)',
-            r'(San Francisco|New York|London|Berlin|India|Bangalore|Mumbai|Delhi)',
-        ]
-        
-        for pattern in location_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in _LOC_PATTERNS:
+            match = pattern.search(text)
             if match:
                 return match.group(1).strip()[:100]
         
@@ -66,8 +89,7 @@ class HNHiringScraper(BaseScraper):
             return ""
         
         # Find URLs in text
-        url_pattern = r'https?://[^\s<>"{}|\\^`\[\]]+'
-        urls = re.findall(url_pattern, text)
+        urls = _RE_URL.findall(text)
         
         # Prefer job/career URLs
         for url in urls:
@@ -76,9 +98,10 @@ class HNHiringScraper(BaseScraper):
         
         return urls[0] if urls else ""
 
-    def scrape(self, thread_id: int = None, limit: int = 20) -> list[JobPostingCreate]:
+    async def ascrape(self, thread_id: int = None, limit: int = 20) -> list[JobPostingCreate]:
         """
         Scrape job postings from a HN "Who's Hiring" thread.
+        Comments are fetched concurrently once the thread is loaded.
         
         Args:
             thread_id: HN item ID of the hiring thread
@@ -87,23 +110,28 @@ class HNHiringScraper(BaseScraper):
         Returns:
             List of JobPostingCreate objects
         """
+        async with self._open():
+            return await self._scrape_thread(thread_id or self.DEFAULT_THREAD_ID, limit)
+
+    async def _scrape_thread(self, thread_id: int, limit: int) -> list[JobPostingCreate]:
+        """Fetch a hiring thread and its top-level comments."""
         jobs = []
-        thread_id = thread_id or self.DEFAULT_THREAD_ID
         
         # Fetch the thread to get comment IDs
         thread_url = self.THREAD_URL.format(item_id=thread_id)
-        thread_data = self.fetch_json(thread_url)
+        thread_data = await self.fetch_json(thread_url)
         
         if not thread_data:
-            print(f"Failed to fetch HN thread {thread_id}")
+            logger.warning("Failed to fetch HN thread %s", thread_id)
             return jobs
 
         comment_ids = thread_data.get("kids", [])[:limit]
+        comments = await asyncio.gather(*(
+            self.fetch_json(self.THREAD_URL.format(item_id=comment_id))
+            for comment_id in comment_ids
+        ))
         
-        for comment_id in comment_ids:
-            comment_url = self.THREAD_URL.format(item_id=comment_id)
-            comment_data = self.fetch_json(comment_url)
-            
+        for comment_id, comment_data in zip(comment_ids, comments):
             if not comment_data or comment_data.get("deleted"):
                 continue
             
@@ -111,9 +139,8 @@ class HNHiringScraper(BaseScraper):
             if not text:
                 continue
             
-            # Parse HTML entities
-            soup = BeautifulSoup(text, 'html.parser')
-            clean_text = soup.get_text()
+            # Strip tags and decode HTML entities; paragraphs become lines
+            clean_text = html.unescape(_TAG_RE.sub('', _RE_PARAGRAPH.sub('\n', text)))
             
             try:
                 company = self._extract_company_from_comment(clean_text)
@@ -124,7 +151,8 @@ class HNHiringScraper(BaseScraper):
                     # Use HN comment as fallback
                     apply_url = f"https://news.ycombinator.com/item?id={comment_id}"
                 
-                job_posting = JobPostingCreate(
+                # Every field is already a str/float, see scrapers.base
+                job_posting = JobPostingCreate.model_construct(
                     job_title="Software Engineer",  # HN jobs are usually engineering
                     company=company,
                     location=location,
@@ -135,8 +163,8 @@ class HNHiringScraper(BaseScraper):
                     source=self.source_name
                 )
                 jobs.append(job_posting)
-            except Exception as e:
-                print(f"Error parsing HN comment {comment_id}: {e}")
+            except Exception:
+                logger.warning("Error parsing HN comment %s", comment_id, exc_info=True)
                 continue
 
         return jobs
@@ -144,6 +172,9 @@ class HNHiringScraper(BaseScraper):
 
 # Allow running directly for testing
 if __name__ == "__main__":
+    from ..logging_config import configure_logging
+    configure_logging(buffered=True)
+    
     scraper = HNHiringScraper()
     jobs = scraper.scrape(limit=5)
     
@@ -3,10 +3,14 @@ RemoteOK job scraper.
 Scrapes remote job listings from remoteok.com
 """
 
-from bs4 import BeautifulSoup
+import logging
+from itertools import islice
+from typing import Iterator
 from .base import BaseScraper
 from ..models import JobPostingCreate
 
+logger = logging.getLogger(__name__)
+
 
 class RemoteOKScraper(BaseScraper):
     """
@@ -30,46 +34,55 @@ class RemoteOKScraper(BaseScraper):
         Returns:
             List of JobPostingCreate objects
         """
-        jobs = []
+        return list(self.iter_jobs(limit))
+
+    def iter_jobs(self, limit: int = 20) -> Iterator[JobPostingCreate]:
+        """
+        Yield job listings from RemoteOK one at a time.
+        Each listing is only converted when the caller asks for it.
         
+        Args:
+            limit: Maximum number of jobs to yield
+        """
         # RemoteOK provides a JSON API
         data = self.fetch_json(self.BASE_URL)
         
         if not data:
-            print("Failed to fetch RemoteOK data")
-            return jobs
+            logger.warning("Failed to fetch RemoteOK data")
+            return
 
         # First item is usually metadata, skip it
-        job_listings = data[1:limit + 1] if len(data) > 1 else []
-
-        for job in job_listings:
+        for job in islice(data, 1, limit + 1):
             try:
                 # Extract location - default to Remote if not specified
                 location = job.get("location", "Remote")
                 if not location:
                     location = "Remote"
 
-                # Create job posting
-                job_posting = JobPostingCreate(
-                    job_title=job.get("position", "Unknown Position"),
-                    company=job.get("company", "Unknown Company"),
-                    location=location,
+                # Create job posting; fields are coerced here because
+                # model_construct skips validation (see scrapers.base)
+                job_posting = JobPostingCreate.model_construct(
+                    job_title=str(job.get("position") or "Unknown Position"),
+                    company=str(job.get("company") or "Unknown Company"),
+                    location=str(location),
                     apply_url=f"https://remoteok.com/remote-jobs/{job.get('slug', '')}",
                     lat=20.5937,  # Default to India center - will be geocoded later
                     lng=78.9629,
-                    text=job.get("description", ""),
+                    text=str(job.get("description") or ""),
                     source=self.source_name
                 )
-                jobs.append(job_posting)
-            except Exception as e:
-                print(f"Error parsing job: {e}")
+            except Exception:
+                logger.warning("Error parsing RemoteOK job", exc_info=True)
                 continue
 
-        return jobs
+            yield job_posting
 
 
 # Allow running directly for testing
 if __name__ == "__main__":
+    from ..logging_config import configure_logging
+    configure_logging(buffered=True)
+    
     scraper = RemoteOKScraper()
     jobs = scraper.scrape(limit=5)
     
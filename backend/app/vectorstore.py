@@ -3,11 +3,29 @@ Vector Store Service - Pinecone integration for semantic job search.
 Generates OpenAI embeddings and stores jobs in Pinecone.
 """
 
-from typing import Optional
+import hashlib
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Iterable, Iterator, Optional
+import tiktoken
 from pinecone import Pinecone, ServerlessSpec
 from openai import OpenAI
 from .config import get_settings
+from .embed_cache import EmbeddingCache
 from .models import JobPosting
+from .query_cache import QueryCache, SemanticQueryCache
+
+logger = logging.getLogger(__name__)
+
+
+def chunks(iterable: Iterable, batch_size: int) -> Iterator[tuple]:
+    """Split an iterable into tuples of at most batch_size items."""
+    it = iter(iterable)
+    chunk = tuple(islice(it, batch_size))
+    while chunk:
+        yield chunk
+        chunk = tuple(islice(it, batch_size))
 
 
 class VectorStore:
@@ -16,30 +34,62 @@ class VectorStore:
     """
 
     EMBEDDING_MODEL = "text-embedding-3-small"
-    EMBEDDING_DIMENSION = 1536
+    # Shortened embeddings; changing this requires recreating the index
+    EMBEDDING_DIMENSION = 512
     INDEX_NAME = "india-jobs"
+    
+    # Inputs per embeddings request, and vectors per Pinecone upsert
+    EMBEDDING_BATCH_SIZE = 128
+    UPSERT_BATCH_SIZE = 100
+    
+    # Threads the Pinecone client uses for async_req calls
+    POOL_THREADS = 30
+    
+    # Input limit of the embedding model
+    MAX_EMBEDDING_TOKENS = 8191
 
     def __init__(self):
         self.settings = get_settings()
         self.pc: Optional[Pinecone] = None
         self.index = None
         self.openai_client: Optional[OpenAI] = None
+        # Runs the Pinecone queries of a batch search concurrently
+        self._query_pool = ThreadPoolExecutor(
+            max_workers=self.POOL_THREADS, thread_name_prefix="pinecone-query"
+        )
+        # Loaded in _initialize; needs a network fetch the first time
+        self.encoding: Optional[tiktoken.Encoding] = None
+        self.embedding_cache = EmbeddingCache(
+            self.settings.embedding_cache_path,
+            model=self.EMBEDDING_MODEL,
+            dimension=self.EMBEDDING_DIMENSION
+        )
+        # Content hash of every vector this process has written or fetched
+        self._content_hashes: dict[str, str] = {}
+        self.query_cache = QueryCache(max_size=2000, ttl_seconds=300)
+        self.semantic_cache = SemanticQueryCache(
+            dimension=self.EMBEDDING_DIMENSION,
+            max_size=1024,
+            threshold=0.97,
+            ttl_seconds=300
+        )
         
         self._initialize()
 
     def _initialize(self):
         """Initialize Pinecone and OpenAI clients."""
         if not self.settings.openai_api_key:
-            print("Warning: OpenAI API key not configured")
+            logger.warning("OpenAI API key not configured")
             return
         
         if not self.settings.pinecone_api_key:
-            print("Warning: Pinecone API key not configured")
+            logger.warning("Pinecone API key not configured")
             return
         
         try:
             # Initialize OpenAI
             self.openai_client = OpenAI(api_key=self.settings.openai_api_key)
+            self._load_encoding()
             
             # Initialize Pinecone
             self.pc = Pinecone(api_key=self.settings.pinecone_api_key)
@@ -48,7 +98,7 @@ class VectorStore:
             existing_indexes = [idx.name for idx in self.pc.list_indexes()]
             
             if self.INDEX_NAME not in existing_indexes:
-                print(f"Creating Pinecone index: {self.INDEX_NAME}")
+                logger.info("Creating Pinecone index: %s", self.INDEX_NAME)
                 self.pc.create_index(
                     name=self.INDEX_NAME,
                     dimension=self.EMBEDDING_DIMENSION,
@@ -58,39 +108,168 @@ class VectorStore:
                         region="us-east-1"
                     )
                 )
+            elif self.pc.describe_index(self.INDEX_NAME).dimension != self.EMBEDDING_DIMENSION:
+                logger.warning(
+                    "Pinecone index %s has a different dimension than %d; delete it and reindex",
+                    self.INDEX_NAME, self.EMBEDDING_DIMENSION
+                )
             
-            self.index = self.pc.Index(self.INDEX_NAME)
-            print(f"Pinecone initialized: {self.INDEX_NAME}")
+            self.index = self.pc.Index(self.INDEX_NAME, pool_threads=self.POOL_THREADS)
+            logger.info("Pinecone initialized: %s", self.INDEX_NAME)
             
-        except Exception as e:
-            print(f"Vector store initialization error: {e}")
+        except Exception:
+            logger.warning("Vector store initialization error", exc_info=True)
+
+    def _load_encoding(self):
+        """Load the embedding model's tokenizer, or keep None if it can't be fetched."""
+        try:
+            self.encoding = tiktoken.encoding_for_model(self.EMBEDDING_MODEL)
+        except Exception:
+            logger.warning("Tokenizer unavailable, truncating embedding input by bytes", exc_info=True)
+
+    def _truncate(self, parts: list[str]) -> str:
+        """
+        Join text parts, cut to the embedding model's token limit.
+        Parts are tokenized in order and tokenization stops once the limit
+        is reached, so a long trailing description is never encoded whole
+        and the leading parts always survive.
+        """
+        # Every token covers at least one UTF-8 byte, so texts that are short
+        # in bytes fit as-is (non-ASCII characters can be several tokens each)
+        if sum(len(part.encode("utf-8")) for part in parts) <= self.MAX_EMBEDDING_TOKENS:
+            return "".join(parts)
+        
+        if self.encoding is None:
+            # Every token is at least one UTF-8 byte, so this always fits
+            text = "".join(parts).encode("utf-8")[:self.MAX_EMBEDDING_TOKENS]
+            return text.decode("utf-8", errors="ignore")
+        
+        tokens: list[int] = []
+        for part in parts:
+            remaining = self.MAX_EMBEDDING_TOKENS - len(tokens)
+            # Tokens average ~4 characters, so 8 per token is ample headroom
+            # and spares encoding the rest of a very long description
+            if len(part) > remaining * 8:
+                part = part[:remaining * 8]
+            tokens.extend(self.encoding.encode(part, disallowed_special=())[:remaining])
+            if len(tokens) >= self.MAX_EMBEDDING_TOKENS:
+                break
+        return self.encoding.decode(tokens)
+
+    @staticmethod
+    def _job_parts(job: JobPosting) -> list[str]:
+        """Text parts that get embedded for a job, header first."""
+        return [job.job_title, " at ", job.company, ". Location: ", job.location, ". ", job.text or ""]
+
+    @staticmethod
+    def _job_metadata(job: JobPosting, content_hash: str) -> dict:
+        """Pinecone metadata stored alongside a job's vector."""
+        return {
+            "job_title": job.job_title,
+            "company": job.company,
+            "location": job.location,
+            "apply_url": job.apply_url or "",
+            "lat": job.lat,
+            "lng": job.lng,
+            "text": (job.text or "")[:1000],  # Limit metadata size
+            "content_hash": content_hash
+        }
+
+    @staticmethod
+    def _content_hash(job: JobPosting) -> str:
+        """Hash everything an upsert would write for a job."""
+        digest = hashlib.blake2b(digest_size=16)
+        for part in VectorStore._job_parts(job) + [job.apply_url or "", repr((job.lat, job.lng))]:
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def _unchanged_ids(self, hashes: dict[str, str]) -> set[str]:
+        """
+        Find jobs whose stored vector already has the given content hash.
+        Hashes not seen by this process are fetched from Pinecone.
+        """
+        unknown = [job_id for job_id in hashes if job_id not in self._content_hashes]
+        for batch in chunks(unknown, self.UPSERT_BATCH_SIZE):
+            try:
+                fetched = self.index.fetch(ids=list(batch))
+                for job_id, vector in fetched.vectors.items():
+                    stored = (vector.metadata or {}).get("content_hash")
+                    if stored:
+                        self._content_hashes[job_id] = stored
+            except Exception:
+                # Re-embedding is the safe fallback
+                logger.warning("Fetch error", exc_info=True)
+        
+        return {
+            job_id for job_id, content_hash in hashes.items()
+            if self._content_hashes.get(job_id) == content_hash
+        }
 
-    def generate_embedding(self, text: str) -> Optional[list[float]]:
+    def generate_embedding(self, parts: list[str], use_disk_cache: bool = False) -> Optional[list[float]]:
         """
         Generate embedding for text using OpenAI.
         
         Args:
-            text: Text to embed
+            parts: Text to embed, as parts joined without separators
+            use_disk_cache: Read and write the on-disk embedding cache
             
         Returns:
             Embedding vector or None if failed
         """
+        embeddings = self.generate_embeddings_batch([parts], use_disk_cache=use_disk_cache)
+        return embeddings[0] if embeddings else None
+
+    def generate_embeddings_batch(
+        self,
+        texts: list[list[str]],
+        use_disk_cache: bool = False
+    ) -> Optional[list[list[float]]]:
+        """
+        Generate embeddings for many texts with as few OpenAI requests as possible.
+        
+        Args:
+            texts: Texts to embed, each as parts joined without separators
+            use_disk_cache: Read and write the on-disk embedding cache. Meant
+                for indexing, where the same job texts recur; search queries
+                would only grow the cache without bound.
+            
+        Returns:
+            Embedding vectors in input order, or None if failed
+        """
         if not self.openai_client:
             return None
         
+        inputs = [self._truncate(parts) for parts in texts]
+        if use_disk_cache:
+            embeddings = self.embedding_cache.get_many(inputs)
+        else:
+            embeddings = [None] * len(inputs)
+        misses = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        
         try:
-            response = self.openai_client.embeddings.create(
-                model=self.EMBEDDING_MODEL,
-                input=text[:8000]  # Limit text length
-            )
-            return response.data[0].embedding
-        except Exception as e:
-            print(f"Embedding error: {e}")
+            for batch in chunks(misses, self.EMBEDDING_BATCH_SIZE):
+                response = self.openai_client.embeddings.create(
+                    model=self.EMBEDDING_MODEL,
+                    input=[inputs[i] for i in batch],
+                    dimensions=self.EMBEDDING_DIMENSION
+                )
+                for i, data in zip(batch, response.data):
+                    embeddings[i] = data.embedding
+        except Exception:
+            logger.warning("Embedding error", exc_info=True)
             return None
+        
+        if use_disk_cache and misses:
+            self.embedding_cache.put_many(
+                [inputs[i] for i in misses], [embeddings[i] for i in misses]
+            )
+        return embeddings
 
     def upsert_job(self, job_id: str, job: JobPosting) -> bool:
         """
         Store a job posting in Pinecone.
+        Skipped when the stored vector was built from the same content.
         
         Args:
             job_id: Unique job identifier
@@ -102,10 +281,11 @@ class VectorStore:
         if not self.index:
             return False
         
-        # Create text for embedding
-        text_to_embed = f"{job.job_title} at {job.company}. Location: {job.location}. {job.text or ''}"
+        content_hash = self._content_hash(job)
+        if self._unchanged_ids({job_id: content_hash}):
+            return True
         
-        embedding = self.generate_embedding(text_to_embed)
+        embedding = self.generate_embedding(self._job_parts(job), use_disk_cache=True)
         if not embedding:
             return False
         
@@ -113,19 +293,15 @@ class VectorStore:
             self.index.upsert(vectors=[{
                 "id": job_id,
                 "values": embedding,
-                "metadata": {
-                    "job_title": job.job_title,
-                    "company": job.company,
-                    "location": job.location,
-                    "apply_url": job.apply_url or "",
-                    "lat": job.lat,
-                    "lng": job.lng,
-                    "text": (job.text or "")[:1000]  # Limit metadata size
-                }
+                "metadata": self._job_metadata(job, content_hash)
             }])
+            self._content_hashes[job_id] = content_hash
+            # Cached results may no longer reflect the index
+            self.query_cache.invalidate()
+            self.semantic_cache.invalidate()
             return True
-        except Exception as e:
-            print(f"Upsert error: {e}")
+        except Exception:
+            logger.warning("Upsert error", exc_info=True)
             return False
 
     def semantic_search(
@@ -148,38 +324,138 @@ class VectorStore:
         if not self.index:
             return []
         
-        embedding = self.generate_embedding(query)
+        cache_key = QueryCache.make_key(query, top_k, location_filter)
+        cached = self.query_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        embedding = self.generate_embedding([query])
         if not embedding:
             return []
         
+        # A near-identical earlier query saves the Pinecone round-trip
+        params = (top_k, location_filter)
+        similar = self.semantic_cache.get(embedding, params)
+        if similar is not None:
+            self.query_cache.put(cache_key, similar)
+            return similar
+        
         try:
-            # Build filter if location specified
-            filter_dict = None
-            if location_filter:
-                filter_dict = {"location": {"$eq": location_filter}}
-            
             results = self.index.query(
                 vector=embedding,
                 top_k=top_k,
                 include_metadata=True,
-                filter=filter_dict
+                filter=self._location_filter(location_filter)
             )
             
-            jobs = []
-            for match in results.matches:
-                job = {
-                    "id": match.id,
-                    "score": match.score,
-                    **match.metadata
-                }
-                jobs.append(job)
-            
+            jobs = self._matches_to_jobs(results)
+            self.query_cache.put(cache_key, jobs)
+            self.semantic_cache.put(embedding, params, jobs)
             return jobs
             
-        except Exception as e:
-            print(f"Search error: {e}")
+        except Exception:
+            logger.warning("Search error", exc_info=True)
             return []
 
+    def semantic_search_batch(
+        self,
+        queries: list[str],
+        top_k: int = 10,
+        location_filters: Optional[list[Optional[str]]] = None
+    ) -> list[list[dict]]:
+        """
+        Run several semantic searches with one embeddings request and
+        Pinecone queries running concurrently on a thread pool.
+        
+        Args:
+            queries: Search queries
+            top_k: Number of results to return per query
+            location_filters: Optional location filter per query
+            
+        Returns:
+            One list of job results per query, in input order
+        """
+        location_filters = location_filters or [None] * len(queries)
+        results: list[list[dict]] = [[] for _ in queries]
+        if not self.index:
+            return results
+        
+        # Only queries missing from the exact cache need an embedding
+        keys = [
+            QueryCache.make_key(query, top_k, location)
+            for query, location in zip(queries, location_filters)
+        ]
+        pending = []
+        for i, key in enumerate(keys):
+            cached = self.query_cache.get(key)
+            if cached is not None:
+                results[i] = cached
+            else:
+                pending.append(i)
+        if not pending:
+            return results
+        
+        embeddings = self.generate_embeddings_batch([[queries[i]] for i in pending])
+        if not embeddings:
+            return results
+        
+        to_query = []
+        for i, embedding in zip(pending, embeddings):
+            params = (top_k, location_filters[i])
+            similar = self.semantic_cache.get(embedding, params)
+            if similar is not None:
+                results[i] = similar
+                self.query_cache.put(keys[i], similar)
+            else:
+                to_query.append((i, embedding, params))
+        
+        def query(embedding, location):
+            return self.index.query(
+                vector=embedding,
+                top_k=top_k,
+                include_metadata=True,
+                filter=self._location_filter(location)
+            )
+        
+        # Plain query() calls on worker threads; async_req on query() is
+        # not reliable across Pinecone SDK versions (3.x fails to parse
+        # the ApplyResult it gets back)
+        futures = [
+            self._query_pool.submit(query, embedding, location_filters[i])
+            for i, embedding, _ in to_query
+        ]
+        
+        for future, (i, embedding, params) in zip(futures, to_query):
+            try:
+                response = future.result()
+            except Exception:
+                logger.warning("Search error", exc_info=True)
+                continue
+            
+            jobs = self._matches_to_jobs(response)
+            results[i] = jobs
+            self.query_cache.put(keys[i], jobs)
+            self.semantic_cache.put(embedding, params, jobs)
+        
+        return results
+
+    @staticmethod
+    def _location_filter(location: Optional[str]) -> Optional[dict]:
+        """Build a Pinecone metadata filter if a location is specified."""
+        return {"location": {"$eq": location}} if location else None
+
+    @staticmethod
+    def _matches_to_jobs(results) -> list[dict]:
+        """Flatten a Pinecone query response into job dicts with scores."""
+        return [
+            {
+                "id": match.id,
+                "score": match.score,
+                **match.metadata
+            }
+            for match in results.matches
+        ]
+
     def index_sample_jobs(self) -> int:
         """
         Index the sample jobs from /pins endpoint for testing.
@@ -189,9 +465,11 @@ class VectorStore:
         """
         from .routers.pins import SAMPLE_PINS
         
-        count = 0
-        for pin in SAMPLE_PINS:
-            job = JobPosting(
+        if not self.index:
+            return 0
+        
+        jobs = [
+            JobPosting(
                 id=pin.id,
                 job_title=pin.job_title,
                 company=pin.company_name,
@@ -201,12 +479,55 @@ class VectorStore:
                 lng=pin.longitude,
                 text=pin.description
             )
-            
-            if self.upsert_job(pin.id, job):
-                count += 1
-                print(f"  Indexed: {pin.job_title} at {pin.company_name}")
+            for pin in SAMPLE_PINS
+        ]
+        
+        # Pins already indexed with the same content need no new embedding
+        hashes = {job.id: self._content_hash(job) for job in jobs}
+        unchanged = self._unchanged_ids(hashes)
+        jobs = [job for job in jobs if job.id not in unchanged]
+        if not jobs:
+            logger.info("All %d sample jobs already indexed", len(unchanged))
+            return len(unchanged)
+        
+        # One embeddings request for all pins instead of one per pin
+        embeddings = self.generate_embeddings_batch(
+            [self._job_parts(job) for job in jobs], use_disk_cache=True
+        )
+        if not embeddings:
+            return len(unchanged)
+        
+        vectors = [
+            {
+                "id": job.id,
+                "values": embedding,
+                "metadata": self._job_metadata(job, hashes[job.id])
+            }
+            for job, embedding in zip(jobs, embeddings)
+        ]
         
-        return count
+        # Fire every batch at once and wait for all of them, so upserts overlap
+        async_results = [
+            self.index.upsert(vectors=list(batch), async_req=True)
+            for batch in chunks(vectors, self.UPSERT_BATCH_SIZE)
+        ]
+        
+        count = 0
+        for batch, result in zip(chunks(vectors, self.UPSERT_BATCH_SIZE), async_results):
+            try:
+                count += result.get().upserted_count
+                self._content_hashes.update(
+                    (vector["id"], vector["metadata"]["content_hash"]) for vector in batch
+                )
+            except Exception:
+                logger.warning("Upsert error", exc_info=True)
+        
+        if count:
+            self.query_cache.invalidate()
+            self.semantic_cache.invalidate()
+        
+        logger.info("Indexed %d sample jobs (%d unchanged)", count, len(unchanged))
+        return count + len(unchanged)
 
     def get_index_stats(self) -> dict:
         """Get statistics about the Pinecone index."""
@@ -224,21 +545,12 @@ class VectorStore:
             return {"error": str(e)}
 
 
-# Singleton instance
-_vector_store: Optional[VectorStore] = None
-
-
-def get_vector_store() -> VectorStore:
-    """Get or create the vector store instance."""
-    global _vector_store
-    if _vector_store is None:
-        _vector_store = VectorStore()
-    return _vector_store
-
-
 # Allow running directly for testing
 if __name__ == "__main__":
-    vs = get_vector_store()
+    from .logging_config import configure_logging
+    configure_logging()
+    
+    vs = VectorStore()
     
     print("\n=== Vector Store Test ===\n")
     
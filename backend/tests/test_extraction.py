@@ -0,0 +1,51 @@
+"""
+Pages with complete schema.org JobPosting data must be extracted without
+calling the LLM.
+"""
+
+from app.agents.extraction import ExtractionAgent
+
+# _fast_extract reads no agent state, so skip building the LLM clients
+agent = ExtractionAgent.__new__(ExtractionAgent)
+
+POSTING = {
+    "@type": "JobPosting",
+    "title": "Backend Engineer",
+    "hiringOrganization": {"@type": "Organization", "name": "Acme"},
+    "jobLocation": [{
+        "@type": "Place",
+        "address": {
+            "addressLocality": "Bengaluru",
+            "addressRegion": "KA",
+            "addressCountry": {"name": "IN"}
+        }
+    }],
+    "description": "<p>Build &amp; ship <b>APIs</b></p>"
+}
+
+
+def test_complete_job_posting_is_extracted():
+    job = agent._fast_extract({"url": "https://example.com/jobs/1", "job_posting": POSTING})
+
+    assert job is not None
+    assert job.job_title == "Backend Engineer"
+    assert job.company == "Acme"
+    assert job.location == "Bengaluru, KA, IN"
+    assert job.description == "Build & ship APIs"
+    # The page URL stands in when the posting has none
+    assert job.apply_url == "https://example.com/jobs/1"
+
+
+def test_telecommute_posting_is_remote():
+    posting = {**POSTING, "jobLocationType": "TELECOMMUTE", "url": "https://acme.example/apply"}
+    job = agent._fast_extract({"url": "https://example.com/jobs/1", "job_posting": posting})
+
+    assert job.location == "Remote"
+    assert job.apply_url == "https://acme.example/apply"
+
+
+def test_incomplete_posting_falls_back_to_llm():
+    posting = {key: value for key, value in POSTING.items() if key != "hiringOrganization"}
+
+    assert agent._fast_extract({"job_posting": posting}) is None
+    assert agent._fast_extract({"content": "no structured data"}) is None
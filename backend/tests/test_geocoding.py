@@ -0,0 +1,44 @@
+"""
+City matching must prefer a named city over generic keys like "remote",
+and loop-bound state must follow the running event loop.
+"""
+
+import asyncio
+from app.agents.geocoding import GeocodingAgent
+
+CITIES = GeocodingAgent.CITY_CACHE
+
+
+def test_named_city_beats_generic_location():
+    agent = GeocodingAgent()
+    assert agent._lookup_city("remote, bangalore") == CITIES["bangalore"]
+    assert agent._lookup_city("bengaluru / remote") == CITIES["bengaluru"]
+
+
+def test_generic_location_is_the_fallback():
+    agent = GeocodingAgent()
+    assert agent._lookup_city("india") == CITIES["india"]
+    assert agent._lookup_city("remote (india)") == CITIES["remote"]
+
+
+def test_longest_city_name_wins():
+    agent = GeocodingAgent()
+    assert agent._lookup_city("new delhi, india") == CITIES["new delhi"]
+
+
+def test_unknown_location_misses():
+    agent = GeocodingAgent()
+    assert agent._lookup_city("springfield") is None
+
+
+def test_each_event_loop_gets_its_own_lock():
+    agent = GeocodingAgent()
+
+    async def lookup():
+        coords = await agent._geocode_location("Bangalore")
+        return coords, agent._nominatim_lock
+
+    first_coords, first_lock = asyncio.run(lookup())
+    second_coords, second_lock = asyncio.run(lookup())
+    assert first_coords == second_coords == CITIES["bangalore"]
+    assert first_lock is not second_lock
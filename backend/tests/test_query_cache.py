@@ -0,0 +1,54 @@
+"""
+The semantic query cache must match near-identical embeddings only, and
+only for the same search parameters.
+"""
+
+import numpy as np
+from app.query_cache import SemanticQueryCache
+
+DIMENSION = 64
+
+
+def _vector(seed: int) -> np.ndarray:
+    return np.random.default_rng(seed).standard_normal(DIMENSION)
+
+
+def test_similar_embedding_hits():
+    cache = SemanticQueryCache(dimension=DIMENSION, max_size=8)
+    embedding = _vector(0)
+    cache.put(embedding, ("bangalore", 10), ["job"])
+
+    # Scaled and slightly perturbed vectors are still the same query
+    assert cache.get(embedding * 3, ("bangalore", 10)) == ["job"]
+    assert cache.get(embedding + 0.01 * _vector(1), ("bangalore", 10)) == ["job"]
+
+
+def test_different_embedding_or_params_miss():
+    cache = SemanticQueryCache(dimension=DIMENSION, max_size=8)
+    embedding = _vector(0)
+    cache.put(embedding, ("bangalore", 10), ["job"])
+
+    assert cache.get(_vector(2), ("bangalore", 10)) is None
+    assert cache.get(embedding, ("bangalore", 20)) is None
+    assert cache.stats()["misses"] == 2
+
+
+def test_invalidate_and_expiry_drop_entries():
+    cache = SemanticQueryCache(dimension=DIMENSION, max_size=8)
+    embedding = _vector(0)
+    cache.put(embedding, None, ["job"])
+    cache.invalidate()
+    assert cache.get(embedding, None) is None
+
+    expired = SemanticQueryCache(dimension=DIMENSION, max_size=8, ttl_seconds=-1)
+    expired.put(embedding, None, ["job"])
+    assert expired.get(embedding, None) is None
+
+
+def test_full_cache_reuses_oldest_slot():
+    cache = SemanticQueryCache(dimension=DIMENSION, max_size=2)
+    for seed in range(3):
+        cache.put(_vector(seed), None, seed)
+
+    assert cache.get(_vector(0), None) is None
+    assert cache.get(_vector(2), None) == 2
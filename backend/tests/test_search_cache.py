@@ -0,0 +1,29 @@
+"""
+Response cache keys for the search router must be clearable by namespace.
+"""
+
+import asyncio
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.inmemory import InMemoryBackend
+from fastapi_cache.decorator import cache
+from app.routers.search import CACHE_NAMESPACE, _cache_key_builder
+
+
+def test_clearing_namespace_drops_cached_responses():
+    FastAPICache.init(InMemoryBackend(), prefix="jobmap")
+    calls = []
+
+    @cache(expire=60, namespace=CACHE_NAMESPACE, key_builder=_cache_key_builder)
+    async def cached_search(q: str):
+        calls.append(q)
+        return {"calls": len(calls)}
+
+    async def scenario():
+        assert await cached_search(q="Bangalore") == {"calls": 1}
+        # Normalized query hits the same entry
+        assert await cached_search(q=" bangalore ") == {"calls": 1}
+
+        await FastAPICache.clear(namespace=CACHE_NAMESPACE)
+        assert await cached_search(q="Bangalore") == {"calls": 2}
+
+    asyncio.run(scenario())
@@ -0,0 +1,48 @@
+"""
+Embedding input must be cut to the model's token limit while keeping the
+job header that comes first.
+"""
+
+from app.vectorstore import VectorStore
+
+LIMIT = VectorStore.MAX_EMBEDDING_TOKENS
+HEADER = ["Data Analyst", " at ", "Acme", ". Location: ", "Pune", ". "]
+
+
+class _ByteEncoding:
+    """Stand-in tokenizer with one token per UTF-8 byte, the worst case."""
+
+    def encode(self, text: str, disallowed_special=()) -> list[int]:
+        return list(text.encode("utf-8"))
+
+    def decode(self, tokens: list[int]) -> str:
+        return bytes(tokens).decode("utf-8", errors="ignore")
+
+
+def _store(encoding=None) -> VectorStore:
+    # _truncate only needs the tokenizer, not the API clients
+    store = VectorStore.__new__(VectorStore)
+    store.encoding = encoding
+    return store
+
+
+def test_short_text_is_joined_unchanged():
+    parts = HEADER + ["Short description"]
+    assert _store(_ByteEncoding())._truncate(parts) == "".join(parts)
+
+
+def test_long_text_is_cut_to_the_limit_keeping_the_header():
+    encoding = _ByteEncoding()
+    parts = HEADER + ["विवरण " * 5000]
+    text = _store(encoding)._truncate(parts)
+
+    assert text.startswith("".join(HEADER))
+    assert len(encoding.encode(text)) <= LIMIT
+
+
+def test_byte_fallback_without_tokenizer():
+    parts = HEADER + ["description " * 2000]
+    text = _store()._truncate(parts)
+
+    assert text.startswith("".join(HEADER))
+    assert len(text.encode("utf-8")) <= LIMIT